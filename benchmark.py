@@ -0,0 +1,284 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from processamento_dos_dados import (carregar_banco, calcular_idades, obter_faixas_etarias, classificar_confirmacao,
+                                     contar_por_periodo_e_faixa, agregar_banco, semana_epidemiologica, AgregadoAnual, horizontes, metricas)
+from cache_agregados import agregar_banco_com_cache
+from estimativa_via_bootstrap import bootstrap_ic_proporcao, estimar_todos, reamostragens_por_bloco
+from estimativa_via_distribuicao_normal import estimar_via_normal
+
+# Benchmark do pipeline leitura -> classificação -> agregação -> estimativa -> renderização sobre
+# bancos sintéticos com as mesmas colunas das exportações do SINAN em "Banco de dados". Cada etapa
+# é medida separadamente (tempo, linhas/s e pico de memória RSS) e os resultados vão para um JSON,
+# que pode ser comparado com o de uma execução anterior. Exemplos:
+#   python benchmark.py --tamanhos 1k 30k 1M
+#   python benchmark.py --saida depois.json --comparar antes.json
+
+tamanhos = {'1k': 1_000, '30k': 30_000, '1M': 1_000_000, '10M': 10_000_000}
+
+# Colunas das exportações do SINAN (as mesmas, na mesma ordem, dos .csv de "Banco de dados")
+colunas_sinan = (
+    'NU_NOTIFIC,TP_NOT,ID_AGRAVO,DT_NOTIFIC,SEM_NOT,NU_ANO,SG_UF_NOT,ID_MUNICIP,ID_REGIONA,ID_UNIDADE,DT_SIN_PRI,'
+    'SEM_PRI,DT_NASC,SOUNDEX,NU_IDADE_N,CS_SEXO,CS_GESTANT,CS_RACA,CS_ESCOL_N,SG_UF,ID_MN_RESI,ID_RG_RESI,ID_DISTRIT,'
+    'ID_BAIRRO,NM_BAIRRO,ID_GEO1,ID_GEO2,CS_ZONA,ID_PAIS,DT_INVEST,ID_OCUPA_N,FEBRE,MIALGIA,CEFALEIA,EXANTEMA,VOMITO,'
+    'NAUSEA,DOR_COSTAS,CONJUNTVIT,ARTRITE,ARTRALGIA,PETEQUIA_N,LEUCOPENIA,LACO,DOR_RETRO,DIABETES,HEMATOLOG,HEPATOPAT,'
+    'RENAL,HIPERTENSA,ACIDO_PEPT,AUTO_IMUNE,DT_CHIK_S1,DT_CHIK_S2,DT_PRNT,RES_CHIKS1,RES_CHIKS2,RESUL_PRNT,DT_SORO,'
+    'RESUL_SORO,DT_NS1,RESUL_NS1,DT_VIRAL,RESUL_VI_N,DT_PCR,RESUL_PCR_,SOROTIPO,HISTOPA_N,IMUNOH_N,HOSPITALIZ,'
+    'DT_INTERNA,UF,MUNICIPIO,HOSPITAL,DDD_HOSP,TEL_HOSP,TPAUTOCTO,COUFINF,COPAISINF,COMUNINF,CODISINF,CO_BAINF,'
+    'NOBAIINF,CLASSI_FIN,CRITERIO,DOENCA_TRA,CLINC_CHIK,EVOLUCAO,DT_OBITO,DT_ENCERRA,ALRM_HIPOT,ALRM_PLAQ,ALRM_VOM,'
+    'ALRM_SANG,ALRM_HEMAT,ALRM_ABDOM,ALRM_LETAR,ALRM_HEPAT,ALRM_LIQ,DT_ALRM,GRAV_PULSO,GRAV_CONV,GRAV_ENCH,GRAV_INSUF,'
+    'GRAV_TAQUI,GRAV_EXTRE,GRAV_HIPOT,GRAV_HEMAT,GRAV_MELEN,GRAV_METRO,GRAV_SANG,GRAV_AST,GRAV_MIOC,GRAV_CONSC,'
+    'GRAV_ORGAO,DT_GRAV,MANI_HEMOR,EPISTAXE,GENGIVO,METRO,PETEQUIAS,HEMATURA,SANGRAM,LACO_N,PLASMATICO,EVIDENCIA,'
+    'PLAQ_MENOR,CON_FHD,COMPLICA,NU_LOTE_I,DS_OBS,TP_SISTEMA,NDUPLIC_N,DT_DIGITA,DT_TRANSUS,DT_TRANSDM,DT_TRANSSM,'
+    'DT_TRANSRM,DT_TRANSRS,DT_TRANSSE,NU_LOTE_V,NU_LOTE_H,CS_FLXRET,FLXRECEBI,IDENT_MICR,MIGRADO_W'
+).split(',')
+
+# Distribuições observadas nos bancos de São Carlos (2016-2023): notificações por mês e códigos
+# de classificação/resultado (NaN = campo vazio)
+peso_meses = [0.079, 0.094, 0.15, 0.217, 0.173, 0.064, 0.032, 0.028, 0.038, 0.045, 0.041, 0.039]
+distribuicoes_codigos = {
+    'CLASSI_FIN': ([5, 10, 8, 11, 12, np.nan], [0.66, 0.2188, 0.1084, 0.012, 0.0002, 0.0006]),
+    'RESUL_SORO': ([4, 2, 1, 3, np.nan], [0.6327, 0.2628, 0.0657, 0.0036, 0.0352]),
+    'RESUL_NS1': ([4, 2, 1, 3, np.nan], [0.6099, 0.2943, 0.0593, 0.0005, 0.036]),
+    'RESUL_PCR_': ([4, 2, 1, 3, np.nan], [0.946, 0.0098, 0.0008, 0.0007, 0.0427])
+}
+taxa_obitos = 0.0018
+taxa_nascimento_vazio = 0.006
+
+ano_sintetico = 2023
+linhas_por_bloco_geracao = 500_000
+
+
+def gerar_bloco(rng, n, primeiro_numero):
+    # n notificações sintéticas de ano_sintetico, com todas as colunas do SINAN (as não usadas na
+    # análise ficam vazias)
+    meses = rng.choice(12, size=n, p=np.asarray(peso_meses) / sum(peso_meses))
+    inicio_mes = pd.to_datetime([f'{ano_sintetico}-{mes + 1:02d}-01' for mes in range(12)]).to_numpy()
+    dias_no_mes = np.array([pd.Timestamp(ano_sintetico, mes + 1, 1).days_in_month for mes in range(12)])
+    dt_notific = pd.Series(inicio_mes[meses] + (rng.random(n) * dias_no_mes[meses]).astype('timedelta64[D]'))
+    dt_sin_pri = dt_notific - pd.to_timedelta(rng.integers(0, 8, n), unit='D')
+    dt_nasc = dt_notific - pd.to_timedelta(rng.integers(0, 90 * 365, n), unit='D')
+    dt_nasc[rng.random(n) < taxa_nascimento_vazio] = pd.NaT
+    com_obito = rng.random(n) < taxa_obitos
+    dt_obito = (dt_notific + pd.to_timedelta(rng.integers(0, 30, n), unit='D')).where(com_obito)
+
+    ano_not, semana_not = semana_epidemiologica(dt_notific)
+    ano_pri, semana_pri = semana_epidemiologica(dt_sin_pri)
+
+    df = pd.DataFrame(index=pd.RangeIndex(n), columns=colunas_sinan, dtype=object)
+    df['NU_NOTIFIC'] = np.arange(primeiro_numero, primeiro_numero + n)
+    df['TP_NOT'] = 2
+    df['ID_AGRAVO'] = 'A90'
+    df['DT_NOTIFIC'] = dt_notific
+    df['SEM_NOT'] = ano_not * 100 + semana_not
+    df['NU_ANO'] = ano_sintetico
+    df['DT_SIN_PRI'] = dt_sin_pri
+    df['SEM_PRI'] = ano_pri * 100 + semana_pri
+    df['DT_NASC'] = dt_nasc
+    df['CS_SEXO'] = rng.choice(['M', 'F'], size=n)
+    for coluna, (codigos, pesos) in distribuicoes_codigos.items():
+        df[coluna] = pd.array(rng.choice(codigos, size=n, p=np.asarray(pesos) / sum(pesos)), dtype='Int64')
+    df['EVOLUCAO'] = pd.array(np.where(com_obito, 2, 1), dtype='Int64')
+    df['DT_OBITO'] = dt_obito
+    return df
+
+
+def gerar_banco(caminho, n_linhas, semente=0):
+    # Grava o banco sintético em blocos (a memória não cresce com n_linhas). Com a mesma semente,
+    # o arquivo gerado é sempre o mesmo, então é reaproveitado entre execuções.
+    if os.path.exists(caminho):
+        return caminho
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    rng = np.random.default_rng(semente)
+    temporario = caminho + '.tmp'
+    for inicio in range(0, n_linhas, linhas_por_bloco_geracao):
+        n = min(linhas_por_bloco_geracao, n_linhas - inicio)
+        gerar_bloco(rng, n, inicio + 1).to_csv(temporario, mode='w' if inicio == 0 else 'a', header=inicio == 0,
+                                                index=False, date_format='%Y-%m-%d')
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def zerar_pico_rss():
+    # No Linux, zera o pico de memória (VmHWM) do processo, para medir o pico de cada etapa
+    try:
+        with open('/proc/self/clear_refs', 'w') as arquivo:
+            arquivo.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def pico_rss_mb():
+    # Pico de memória residente do processo, em MB (None se não for possível medir)
+    try:
+        with open('/proc/self/status') as arquivo:
+            for linha in arquivo:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def medir(resultados, tamanho, linhas, etapa, funcao, repeticoes=1):
+    # Executa a etapa repeticoes vezes, guarda o melhor tempo, a mediana, as linhas/s e o pico de
+    # memória em resultados e devolve o resultado da última execução
+    por_etapa = zerar_pico_rss()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    melhor = min(tempos)
+    resultados.append({
+        'tamanho': tamanho,
+        'linhas': linhas,
+        'etapa': etapa,
+        'segundos': melhor,
+        'segundos_mediana': statistics.median(tempos),
+        'repeticoes': repeticoes,
+        'linhas_por_segundo': linhas / melhor if linhas and melhor > 0 else None,
+        'pico_rss_mb': pico_rss_mb(),
+        'pico_rss_da_etapa': por_etapa
+    })
+    print(f'{tamanho or "-":>5} {etapa:<40} {melhor:10.4f} s  {resultados[-1]["pico_rss_mb"] or 0:9.1f} MB', flush=True)
+    return resultado
+
+
+def medir_banco(resultados, tamanho, caminho, diretorio, repeticoes):
+    # Etapas que dependem do tamanho do banco: leitura, idade/faixa etária, classificação,
+    # contagem, agregação em blocos (csv, parquet e com cache) e montagem das figuras do ano
+    n = tamanhos[tamanho]
+    df = medir(resultados, tamanho, n, 'leitura (csv)', lambda: carregar_banco(caminho), repeticoes)
+    faixas = medir(resultados, tamanho, n, 'idade e faixa etária',
+                   lambda: obter_faixas_etarias(calcular_idades(df['DT_NASC'], df['DT_NOTIFIC'])), repeticoes)
+    confirmacao = medir(resultados, tamanho, n, 'classificação', lambda: classificar_confirmacao(df), repeticoes)
+    medir(resultados, tamanho, n, 'contagem (mês e semana)', lambda: contar_por_periodo_e_faixa(df, faixas, confirmacao), repeticoes)
+    del df, faixas, confirmacao
+
+    agregado = medir(resultados, tamanho, n, 'agregação em blocos (csv)', lambda: agregar_banco(caminho), repeticoes)
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        caminho_parquet = os.path.splitext(caminho)[0] + '.parquet'
+        if not os.path.exists(caminho_parquet):
+            carregar_banco(caminho).to_parquet(caminho_parquet, index=False)
+        medir(resultados, tamanho, n, 'agregação em blocos (parquet)', lambda: agregar_banco(caminho_parquet), repeticoes)
+
+    diretorio_cache = os.path.join(diretorio, f'cache_{tamanho}')
+    for arquivo in os.listdir(diretorio_cache) if os.path.isdir(diretorio_cache) else []:
+        os.remove(os.path.join(diretorio_cache, arquivo))
+    medir(resultados, tamanho, n, 'agregação com cache (1ª vez)', lambda: agregar_banco_com_cache(caminho, diretorio_cache))
+    medir(resultados, tamanho, n, 'agregação com cache (em cache)', lambda: agregar_banco_com_cache(caminho, diretorio_cache), repeticoes)
+
+    return agregado
+
+
+def medir_visualizacao(resultados, agregado, diretorio, repeticoes):
+    # Agregado do ano (totais e proporções), montagem das tabelas do visualizador e renderização
+    # das 4 figuras do ano em PNG, no processo atual
+    import visualizacao_dos_dados as visualizacao
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+
+    diretorio_figuras = os.path.join(diretorio, 'figuras')
+    medir(resultados, None, None, 'agregado do ano',
+          lambda: AgregadoAnual(agregado.ano, agregado.cubo, agregado.cubo_semanal), repeticoes)
+    especificacoes = medir(resultados, None, None, 'montagem das figuras do ano',
+                           lambda: visualizacao.registrar_figuras_ano(agregado), repeticoes)
+    medir(resultados, None, None, 'renderização (4 figuras)',
+          lambda: visualizacao.renderizar_figuras(especificacoes, diretorio_figuras, n_processos=1), repeticoes)
+
+
+def medir_estimativas(resultados, n_boot, repeticoes):
+    # Estimativas sobre proporções sintéticas de 9 anos (o custo não depende do tamanho dos bancos)
+    rng = np.random.default_rng(0)
+    proporcoes = np.sort(rng.uniform(0.05, 0.95, size=(9, len(horizontes), len(metricas))), axis=1)
+    dados_bootstrap = {horizonte: proporcoes[:, i] for i, horizonte in enumerate(horizontes)}
+    m_coluna = proporcoes[:, 1, 1]
+
+    medir(resultados, None, n_boot, f'bootstrap (n_boot={n_boot})',
+          lambda: bootstrap_ic_proporcao(m_coluna, 500, n_boot=n_boot, semente=0), repeticoes)
+    # Com um processo e com um por núcleo, sobre pelo menos 16 blocos de reamostragens (o nº de
+    # reamostragens fica em "linhas"), para que o paralelismo seja de fato exercitado mesmo com o
+    # n_boot padrão (um bloco só)
+    n_boot_blocos = max(n_boot, 16 * reamostragens_por_bloco)
+    medir(resultados, None, n_boot_blocos, 'bootstrap em blocos (1 processo)',
+          lambda: bootstrap_ic_proporcao(m_coluna, 500, n_boot=n_boot_blocos, semente=0, n_processos=1), repeticoes)
+    medir(resultados, None, n_boot_blocos, 'bootstrap em blocos (um por núcleo)',
+          lambda: bootstrap_ic_proporcao(m_coluna, 500, n_boot=n_boot_blocos, semente=0), repeticoes)
+    medir(resultados, None, n_boot, f'estimar_todos (n_boot={n_boot})',
+          lambda: estimar_todos(dados_bootstrap, [1000, 500, 300, 10], n_boot=n_boot, semente=0), repeticoes)
+    medir(resultados, None, None, 'aproximação normal', lambda: estimar_via_normal(m_coluna, 500), repeticoes)
+
+
+def comparar(resultados, caminho_anterior):
+    # Razão entre o tempo de cada etapa nesta execução e na anterior (> 1: ficou mais lento)
+    with open(caminho_anterior, encoding='utf-8') as arquivo:
+        anteriores = {(r['tamanho'], r['etapa']): r for r in json.load(arquivo)['resultados']}
+    print('=' * 100)
+    print(f'Comparação com {caminho_anterior}')
+    for r in resultados:
+        anterior = anteriores.get((r['tamanho'], r['etapa']))
+        if anterior:
+            print(f'{r["tamanho"] or "-":>5} {r["etapa"]:<40} {anterior["segundos"]:10.4f} s -> {r["segundos"]:10.4f} s'
+                  f'  ({r["segundos"] / anterior["segundos"]:.2f}x)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do pipeline sobre bancos sintéticos no formato do SINAN.')
+    parser.add_argument('--tamanhos', nargs='+', choices=list(tamanhos), default=['1k', '30k'],
+                        help='tamanhos dos bancos sintéticos (padrão: 1k e 30k; 1M e 10M geram arquivos de centenas de MB a vários GB)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='execuções de cada etapa (vale o melhor tempo)')
+    parser.add_argument('--n-boot', type=int, default=10000, help='nº de reamostragens nas etapas de bootstrap')
+    parser.add_argument('--diretorio', default='.benchmark', help='onde ficam os bancos sintéticos e as figuras')
+    parser.add_argument('--saida', default='benchmark_resultados.json', help='arquivo JSON com os resultados')
+    parser.add_argument('--comparar', default=None, metavar='JSON', help='resultados de uma execução anterior')
+    args = parser.parse_args(argv)
+
+    resultados = []
+    agregado = None
+    for tamanho in args.tamanhos:
+        caminho = gerar_banco(os.path.join(args.diretorio, f'DENGON_sintetico_{tamanho}_00{ano_sintetico}.csv'), tamanhos[tamanho])
+        agregado = medir_banco(resultados, tamanho, caminho, args.diretorio, args.repeticoes)
+    if agregado is not None:
+        medir_visualizacao(resultados, agregado, args.diretorio, args.repeticoes)
+    medir_estimativas(resultados, args.n_boot, args.repeticoes)
+
+    ambiente = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count()
+    }
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump({'ambiente': ambiente, 'resultados': resultados}, arquivo, indent=1, ensure_ascii=False)
+    print(f'Resultados salvos em {args.saida}')
+
+    if args.comparar:
+        comparar(resultados, args.comparar)
+
+
+if __name__ == '__main__':
+    main()
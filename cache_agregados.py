@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from processamento_dos_dados import agregar_banco, regras_confirmacao, AgregadoAnual
+import perfil
+
+# Mudar sempre que o processamento mudar de forma a alterar os agregados já salvos
+versao_cache = 4
+
+# Assinatura do processamento: versão + regras de confirmação em uso
+assinatura_processamento = f'{versao_cache}:{regras_confirmacao!r}'
+
+
+def calcular_hash_conteudo(caminho):
+    # SHA-256 do conteúdo do arquivo, lido em blocos de 1 MB
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def caminho_entrada_cache(caminho_csv, diretorio_cache):
+    # Um arquivo .npz por banco, identificado pelo nome do banco + hash do caminho absoluto
+    caminho_abs = os.path.abspath(caminho_csv)
+    chave = hashlib.sha256(caminho_abs.encode('utf-8')).hexdigest()[:16]
+    nome = os.path.splitext(os.path.basename(caminho_abs))[0]
+    return os.path.join(diretorio_cache, f'{nome}_{chave}.npz')
+
+
+def salvar_entrada_cache(entrada, agregado, meta):
+    # Grava em arquivo temporário e renomeia, para nunca deixar uma entrada pela metade. O nome do
+    # temporário é único, para que duas execuções simultâneas não escrevam no mesmo arquivo.
+    diretorio = os.path.dirname(entrada)
+    os.makedirs(diretorio, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp.npz')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            np.savez(arquivo, ano=np.int64(agregado.ano), cubo=agregado.cubo, cubo_semanal=agregado.cubo_semanal,
+                     meta=np.array(json.dumps(meta)))
+        os.replace(temporario, entrada)
+    except BaseException:
+        os.remove(temporario)
+        raise
+
+
+def diretorio_cache_padrao(caminho_csv):
+    return os.path.join(os.path.dirname(os.path.abspath(caminho_csv)), '.cache_agregados')
+
+
+def consultar_cache(caminho_csv, diretorio_cache=None):
+    # AgregadoAnual salvo para o banco, sem processar nada: None quando não há entrada válida.
+    # A entrada vale enquanto o arquivo tiver o mesmo tamanho e data de modificação; se só a
+    # data mudou, o hash do conteúdo decide. Um banco reenviado com outro conteúdo é reprocessado.
+    # O conjunto Parquet já é lido em milissegundos (e encontrar_bancos só o usa enquanto ele não
+    # for mais antigo que os bancos de origem); o cache vale só para arquivos
+    if os.path.isdir(caminho_csv):
+        return None
+
+    entrada = caminho_entrada_cache(caminho_csv, diretorio_cache or diretorio_cache_padrao(caminho_csv))
+    if not os.path.exists(entrada):
+        return None
+
+    info = os.stat(caminho_csv)
+    try:
+        with perfil.etapa('cache'), np.load(entrada) as arquivo:
+            meta = json.loads(str(arquivo['meta']))
+            agregado = AgregadoAnual(int(arquivo['ano']), arquivo['cubo'], arquivo['cubo_semanal'])
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return None  # Entrada corrompida: reprocessa
+
+    if meta['assinatura'] != assinatura_processamento or meta['tamanho'] != info.st_size:
+        return None
+    if meta['mtime'] == info.st_mtime_ns:
+        return agregado
+    if meta['hash'] == calcular_hash_conteudo(caminho_csv):
+        meta['mtime'] = info.st_mtime_ns
+        salvar_entrada_cache(entrada, agregado, meta)
+        return agregado
+    return None
+
+
+def agregar_banco_com_cache(caminho_csv, diretorio_cache=None):
+    # Mesmo resultado de agregar_banco, mas reaproveita os agregados salvos em disco (ver consultar_cache)
+    agregado = consultar_cache(caminho_csv, diretorio_cache)
+    if agregado is not None:
+        return agregado
+    if os.path.isdir(caminho_csv):
+        return agregar_banco(caminho_csv)
+
+    info = os.stat(caminho_csv)
+    agregado = agregar_banco(caminho_csv)
+    with perfil.etapa('cache'):
+        meta = {
+            'assinatura': assinatura_processamento,
+            'caminho': os.path.abspath(caminho_csv),
+            'tamanho': info.st_size,
+            'mtime': info.st_mtime_ns,
+            'hash': calcular_hash_conteudo(caminho_csv)
+        }
+        salvar_entrada_cache(caminho_entrada_cache(caminho_csv, diretorio_cache or diretorio_cache_padrao(caminho_csv)),
+                             agregado, meta)
+    return agregado
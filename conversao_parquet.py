@@ -0,0 +1,50 @@
+import glob
+import os
+import sys
+
+from processamento_dos_dados import carregar_banco, colunas_numericas
+
+# Converte os bancos anuais (.csv) em um único conjunto Parquet particionado por ano (NU_ANO),
+# com apenas as colunas usadas na análise. Cada ano vira um diretório 'NU_ANO=<ano>'; gravado no
+# diretório padrão (<diretório dos .csv>/parquet), o conjunto é usado automaticamente pelos scripts.
+#
+# Uso: python conversao_parquet.py [diretório dos .csv] [diretório do conjunto Parquet]
+
+
+def converter_para_parquet(caminhos_csv, diretorio_destino):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    particoes = []
+    for caminho_csv in caminhos_csv:
+        df = carregar_banco(caminho_csv, colunas_extras=['NU_ANO'])
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+
+        # Os códigos de resultado têm poucos valores distintos: vão como int8 (nulos preservados)
+        # e são gravados com codificação de dicionário
+        for col in colunas_numericas:
+            tabela = tabela.set_column(tabela.schema.get_field_index(col), col, tabela[col].cast(pa.int8()))
+
+        # O nome do arquivo de origem identifica o arquivo gravado, então reconverter um banco
+        # reenviado substitui a versão anterior em vez de duplicar os registros
+        nome = os.path.splitext(os.path.basename(caminho_csv))[0]
+        pq.write_to_dataset(
+            tabela,
+            diretorio_destino,
+            partition_cols=['NU_ANO'],
+            use_dictionary=colunas_numericas,
+            basename_template=nome + '-{i}.parquet',
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        particoes += [os.path.join(diretorio_destino, f'NU_ANO={ano}') for ano in sorted(df['NU_ANO'].dropna().unique())]
+
+    return particoes
+
+
+if __name__ == '__main__':
+    diretorio_origem = sys.argv[1] if len(sys.argv) > 1 else 'Banco de dados'
+    diretorio_destino = sys.argv[2] if len(sys.argv) > 2 else os.path.join(diretorio_origem, 'parquet')
+
+    caminhos_csv = sorted(glob.glob(os.path.join(diretorio_origem, '*.csv')))
+    for particao in converter_para_parquet(caminhos_csv, diretorio_destino):
+        print(particao)
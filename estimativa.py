@@ -0,0 +1,126 @@
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from processamento_dos_dados import (metricas, horizontes, opcao, inteiro_positivo, nivel_confianca, carregar_agregados,
+                                     adicionar_opcao_dados, encontrar_bancos_da_linha_de_comando,
+                                     proporcoes_acumuladas_por_periodo, posicao_no_ano, interpolar_proporcoes,
+                                     n_periodos_semanais)
+import perfil
+from estimativa_via_bootstrap import intervalos_bootstrap, montar_resultado
+from estimativa_via_distribuicao_normal import estimar_via_normal
+
+# Estimativas do total anual sem interação: todos os parâmetros vêm da linha de comando e o
+# resultado sai em JSON ou CSV (uma linha por dado observado x nível de confiança). Exemplos:
+#   python estimativa.py --horizonte junho --metrica confirmados --dado 500 --ci 90 95 --formato csv
+#   python estimativa.py --data 2025-05-14 --metrica notificados --dado 1200
+# Com --data, a proporção de cada ano na data de corte é interpolada da tabela de proporções
+# acumuladas por semana epidemiológica (ou por mês), calculada a partir dos agregados em cache.
+
+
+def carregar_tabela_proporcoes(caminhos, n_processos=None):
+    # Proporções acumuladas de cada ano consolidado ao fim de cada mês e de cada semana
+    # epidemiológica: anos e {'mes': array (anos, 12, métricas), 'semana': array (anos, períodos semanais, métricas)}.
+    # O ano em curso (incompleto, detectado pela cobertura dos dados) fica fora da amostra
+    dados = carregar_agregados(caminhos, n_processos)
+    anos = dados.anos_consolidados
+    tabela = {
+        'mes': dados.proporcoes,
+        'semana': np.stack([proporcoes_acumuladas_por_periodo(dados.por_ano[ano].cubo_semanal) for ano in anos]) if anos
+                  else np.empty((0, n_periodos_semanais, len(metricas)))
+    }
+    return anos, tabela
+
+
+def proporcoes_no_corte(tabela, horizonte=None, data=None, resolucao='semana'):
+    # Proporção acumulada de cada ano no corte pedido: array (anos, métricas). O corte é o fim do
+    # mês do horizonte ou uma data qualquer, interpolada entre os fins de semana (ou de mês)
+    if data is None:
+        return tabela['mes'][:, horizontes[horizonte] - 1]
+    return interpolar_proporcoes(tabela[resolucao], posicao_no_ano(data, resolucao))
+
+
+def estimar(proporcoes, corte, metrica, dados_observados, metodo='bootstrap', niveis_ci=(95,),
+            n_boot=10000, semente=None, n_processos=None):
+    # Uma linha por dado observado x nível de confiança, a partir das proporções de cada ano no
+    # corte (array (anos, métricas)); corte é só o rótulo (horizonte ou data) da saída. No
+    # bootstrap, as reamostragens não dependem do dado nem do nível: são sorteadas uma vez só
+    m_coluna = proporcoes[:, metricas.index(metrica)]
+    # Anos com casos da métrica (os demais, NaN, ficam fora da estimativa)
+    n_anos = int((~np.isnan(m_coluna)).sum())
+    if metodo == 'bootstrap':
+        media, intervalos = intervalos_bootstrap(m_coluna, niveis_ci, n_boot, semente=semente, n_processos=n_processos)
+    linhas = []
+    for dado in dados_observados:
+        for ci in niveis_ci:
+            if metodo == 'bootstrap':
+                resultado = montar_resultado(media, *intervalos[ci], dado)
+            else:
+                resultado = estimar_via_normal(m_coluna, dado, ci=ci)
+            linhas.append({
+                'metodo': metodo,
+                'corte': corte,
+                'métrica': metrica,
+                'ci': ci,
+                'dado_observado': dado,
+                'media': resultado['media'],
+                'ic_inf': resultado['ic'][0],
+                'ic_sup': resultado['ic'][1],
+                'estimativa': resultado['estimativa'],
+                'estimativa_min': resultado['intervalo_estimado'][0],
+                'estimativa_max': resultado['intervalo_estimado'][1],
+                'n_anos': n_anos
+            })
+    return pd.DataFrame(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Estima o total anual de notificações, confirmados, negativos ou óbitos a partir do '
+                    'número já coletado até o fim de março, junho ou setembro.')
+    corte = parser.add_mutually_exclusive_group(required=True)
+    corte.add_argument('--horizonte', type=opcao(horizontes), choices=list(horizontes),
+                       help='mês até o fim do qual os dados já foram coletados')
+    corte.add_argument('--data', type=pd.Timestamp, metavar='AAAA-MM-DD',
+                       help='data (inclusive) até a qual os dados já foram coletados')
+    parser.add_argument('--resolucao', default='semana', choices=['semana', 'mes'],
+                        help='com --data, interpola entre semanas epidemiológicas ou entre meses')
+    parser.add_argument('--metrica', required=True, type=opcao(metricas), choices=metricas,
+                        help='dado a estimar')
+    parser.add_argument('--dado', required=True, type=int, nargs='+',
+                        help='número já coletado até o corte (um ou mais valores)')
+    parser.add_argument('--metodo', default='bootstrap', choices=['bootstrap', 'normal'])
+    parser.add_argument('--n-boot', type=inteiro_positivo, default=10000, help='nº de reamostragens do bootstrap')
+    parser.add_argument('--ci', type=nivel_confianca, nargs='+', default=[95], help='nível(is) de confiança, em %%')
+    parser.add_argument('--semente', type=int, default=0, help='semente do bootstrap')
+    adicionar_opcao_dados(parser)
+    parser.add_argument('--n-processos', type=inteiro_positivo, default=None, help='processos usados na agregação e no bootstrap')
+    parser.add_argument('--formato', default='json', choices=['json', 'csv'])
+    parser.add_argument('--saida', default=None, help='arquivo de saída (padrão: saída padrão)')
+    perfil.adicionar_opcoes(parser)
+    args = parser.parse_args(argv)
+    perfil.iniciar(args.perfil, args.cprofile)
+
+    anos, tabela = carregar_tabela_proporcoes(encontrar_bancos_da_linha_de_comando(parser, args), args.n_processos)
+    if not anos:
+        parser.error('nenhum ano consolidado no diretório de dados (só há bancos de anos incompletos)')
+    proporcoes = proporcoes_no_corte(tabela, args.horizonte, args.data, args.resolucao)
+    corte = args.horizonte if args.data is None else args.data.strftime('%Y-%m-%d')
+    with perfil.etapa('estimativa'):
+        resultado = estimar(proporcoes, corte, args.metrica, args.dado, args.metodo, args.ci,
+                            args.n_boot, args.semente, args.n_processos)
+
+    saida = args.saida or sys.stdout
+    if args.formato == 'csv':
+        resultado.to_csv(saida, index=False, lineterminator='\n')
+    else:
+        resultado.to_json(saida, orient='records', force_ascii=False, indent=1)
+        if saida is sys.stdout:
+            print()
+    perfil.finalizar()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,396 +1,258 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-from datetime import datetime, date
-from statistics import stdev
+from processamento_dos_dados import (metricas, horizontes, opcao, inteiro_positivo, nivel_confianca, adicionar_opcao_dados,
+                                     carregar_agregados_da_linha_de_comando, exibir_ano, exibir_resumo_geral)
+import perfil
 import numpy as np
 
-fx_et = ['4 anos ou menos', 'entre 5 e 9', 'entre 10 e 14', 'entre 15 e 19', 'entre 20 e 29', 'entre 30 e 39', 
-    'entre 40 e 49', 'entre 50 e 59', 'entre 60 e 69', 'entre 70 e 79', '80 anos ou mais']
-fx_et_completa = fx_et + ['faixa_desconhecida']
-
-
-def calcular_idade(data_nasc, data_notif):
-    if pd.isnull(data_nasc) or pd.isnull(data_notif):
-        return None  # ou pd.NA
-    idade = data_notif.year - data_nasc.year
-    if (data_notif.month, data_notif.day) < (data_nasc.month, data_nasc.day):
-        idade -= 1
-    return idade
-
-
-def obter_faixa_etaria(idade):
-    if idade is None:
-        return None
-    elif idade <= 4:
-        return '4 anos ou menos'
-    elif idade <= 9:
-        return 'entre 5 e 9'
-    elif idade <= 14:
-        return 'entre 10 e 14'
-    elif idade <= 19:
-        return 'entre 15 e 19'
-    elif idade <= 29:
-        return 'entre 20 e 29'
-    elif idade <= 39:
-        return 'entre 30 e 39'
-    elif idade <= 49:
-        return 'entre 40 e 49'
-    elif idade <= 59:
-        return 'entre 50 e 59'
-    elif idade <= 69:
-        return 'entre 60 e 69'
-    elif idade <= 79:
-        return 'entre 70 e 79'
+# Nº de elementos (reamostragens x unidades amostrais) sorteados por lote no bootstrap: limita a
+# memória usada, que fica proporcional ao lote e não a n_boot
+elementos_por_lote = 1_000_000
+
+# Nº de reamostragens de cada bloco do bootstrap. Cada bloco sorteia com o seu próprio gerador,
+# derivado da semente por SeedSequence.spawn, e os blocos são divididos entre os processos: o
+# resultado depende só da semente (e deste tamanho e de reamostragens_por_sorteio), não do nº de
+# processos
+reamostragens_por_bloco = 65536
+
+# Nº de reamostragens sorteadas de uma vez dentro de um bloco, cada sorteio com o seu próprio
+# gerador, derivado do gerador do bloco. Os índices sorteados não dependem do tamanho dos lotes
+# (elementos_por_lote), que só limita a memória usada no cálculo das médias
+reamostragens_por_sorteio = 4096
+
+
+def tipo_indices(n):
+    # Menor tipo inteiro sem sinal capaz de indexar n unidades amostrais
+    for tipo in (np.uint8, np.uint16, np.uint32):
+        if n <= np.iinfo(tipo).max + 1:
+            return tipo
+    return np.uint64
+
+
+def medias_bootstrap(valores, n_boot, semente=None, tamanho_lote=None):
+    # Médias de n_boot reamostragens (com reposição) das linhas de valores, sorteadas em índices
+    # compactos, de reamostragens_por_sorteio em reamostragens_por_sorteio (cada sorteio com um
+    # gerador derivado da semente, um int ou uma SeedSequence), e acumuladas em lotes de até
+    # tamanho_lote reamostragens em um buffer pré-alocado. Com valores 2D (unidades amostrais x
+    # colunas), todas as colunas usam os mesmos índices e o resultado tem forma (n_boot, colunas).
+    valores = np.asarray(valores, dtype=np.float64)
+    n = len(valores)
+    n_colunas = int(np.prod(valores.shape[1:]))
+    if tamanho_lote is None:
+        tamanho_lote = max(1, elementos_por_lote // (n * n_colunas))
+    tipo = tipo_indices(n)
+    if not isinstance(semente, np.random.SeedSequence):
+        semente = np.random.SeedSequence(semente)
+
+    medias = np.empty((n_boot,) + valores.shape[1:])
+    inicios = range(0, n_boot, reamostragens_por_sorteio)
+    for inicio, semente_sorteio in zip(inicios, semente.spawn(len(inicios))):
+        fim = min(inicio + reamostragens_por_sorteio, n_boot)
+        indices = np.random.default_rng(semente_sorteio).integers(0, n, size=(fim - inicio, n), dtype=tipo)
+        for lote in range(inicio, fim, tamanho_lote):
+            fim_lote = min(lote + tamanho_lote, fim)
+            medias[lote:fim_lote] = valores[indices[lote - inicio:fim_lote - inicio]].mean(axis=1)
+    return medias
+
+
+def medias_do_bloco(valores, n_boot, semente_bloco, tamanho_lote=None):
+    # Tarefa de um processo auxiliar: as médias de um bloco de reamostragens
+    return medias_bootstrap(valores, n_boot, semente_bloco, tamanho_lote)
+
+
+def medias_bootstrap_em_blocos(valores, n_boot, semente=None, n_processos=None, tamanho_lote=None):
+    # Como medias_bootstrap, mas com as reamostragens divididas em blocos de reamostragens_por_bloco,
+    # cada um com um gerador independente (SeedSequence(semente).spawn), calculados em paralelo.
+    # n_processos=None usa um processo por núcleo; n_processos=1 (ou o perfil ligado, ou um único
+    # bloco) roda tudo no processo atual, com o mesmo resultado
+    valores = np.asarray(valores, dtype=np.float64)
+    inicios = range(0, n_boot, reamostragens_por_bloco)
+    tamanhos = [min(reamostragens_por_bloco, n_boot - inicio) for inicio in inicios]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    argumentos = ([valores] * len(tamanhos), tamanhos, sementes, [tamanho_lote] * len(tamanhos))
+    if n_processos == 1 or len(tamanhos) <= 1 or perfil.ativo:
+        blocos = list(map(medias_do_bloco, *argumentos))
     else:
-        return '80 anos ou mais'
-
-
-def bootstrap_ic_proporcao(m_coluna, dado_observado, n_boot=10000, ci=95):
-    boots = np.random.choice(m_coluna, size=(n_boot, len(m_coluna)), replace=True)
-    medias = boots.mean(axis=1)
-    alpha = (100 - ci) / 2
-    inf = np.percentile(medias, alpha)
-    sup = np.percentile(medias, 100 - alpha)
-    media = np.mean(m_coluna)
-
-    estimativa = dado_observado / media
-    estimativa_min = dado_observado / sup
-    estimativa_max = dado_observado / inf
-
-    return {
-        "media": media,
-        "ic": (inf, sup),
-        "estimativa": estimativa,
-        "intervalo_estimado": (estimativa_min, estimativa_max)
-    }
-
-
-def processar_banco(caminho_csv):
-    # Carrega o CSV
-    df = pd.read_csv(caminho_csv)
-
-
-    # Tratar os dados
-    df['DT_NASC'] = pd.to_datetime(df['DT_NASC'], format="%Y-%m-%d", errors="coerce")
-    df['DT_NOTIFIC'] = pd.to_datetime(df['DT_NOTIFIC'], format="%Y-%m-%d", errors="coerce")
-    df['DT_OBITO'] = pd.to_datetime(df['DT_OBITO'], format="%Y-%m-%d", errors="coerce")
-    df['RESUL_SORO'] = pd.to_numeric(df['RESUL_SORO'], errors='coerce')
-    df['RESUL_NS1'] = pd.to_numeric(df['RESUL_NS1'], errors='coerce')
-    df['RESUL_PCR_'] = pd.to_numeric(df['RESUL_PCR_'], errors='coerce')
-    df['CLASSI_FIN'] = pd.to_numeric(df['CLASSI_FIN'], errors='coerce')
-
-
-    # Extrai os dados da coluna como lista
-    data_notificacao = df['DT_NOTIFIC'].tolist()
-    data_nascimento = df['DT_NASC'].tolist()
-    resultado_soro = df['RESUL_SORO'].tolist()
-    resultado_ns1 = df['RESUL_NS1'].tolist()
-    resultado_pcr = df['RESUL_PCR_'].tolist()
-    classif_final = df['CLASSI_FIN'].tolist()
-    data_obito = df['DT_OBITO'].tolist()
-
-    # Determinar o ano do banco de dados
-    ano = df['DT_NOTIFIC'].dropna().dt.year.mode()[0]
-
-    # Agrupa os dados com um classificador para cada variável
-    dados_notificacao = {
-        'data_notificacao': data_notificacao,
-        'data_nascimento': data_nascimento,
-        'resultado_soro': resultado_soro ,
-        'resultado_ns1': resultado_ns1, 
-        'resultado_pcr': resultado_pcr, 
-        'classif_final': classif_final, 
-        'data_obito': data_obito,
-        'idade': [],
-        'faixa_etaria': [],
-        'confirmado?': []
-    }
-
-
-    # Determinar a idade do indíviduo no momento da notificação e, logo, a faixa etária que se enquadrava.
-    for i in range(len(df)):
-        idade = calcular_idade(data_nascimento[i], data_notificacao[i])
-        dados_notificacao['idade'].append(idade)
-        dados_notificacao['faixa_etaria'].append(obter_faixa_etaria(idade))
-
-
-    # Determinar se a notificaçao foi confirmada ou não.
-    for i in range(len(df)):
-        if dados_notificacao['classif_final'][i] == 10 or dados_notificacao['classif_final'][i] == 11 or dados_notificacao['classif_final'][i] == 12:
-            dados_notificacao['confirmado?'].append('SIM')
-        elif dados_notificacao['resultado_soro'][i] == 1:
-            dados_notificacao['confirmado?'].append('SIM')
-        elif dados_notificacao['resultado_ns1'][i] == 1:
-            dados_notificacao['confirmado?'].append('SIM')
-        elif dados_notificacao['resultado_pcr'][i] == 1:
-            dados_notificacao['confirmado?'].append('SIM')
-        elif None == dados_notificacao['classif_final'][i] == dados_notificacao['resultado_soro'][i] == dados_notificacao['resultado_ns1'][i] == dados_notificacao['resultado_pcr'][i]:
-            dados_notificacao['confirmado?'].append(None)
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            blocos = list(executor.map(medias_do_bloco, *argumentos))
+    if not blocos:
+        return np.empty((0,) + valores.shape[1:])
+    return np.concatenate(blocos)
+
+
+def medias_bootstrap_sem_faltantes(valores, n_boot, semente=None, n_processos=None, tamanho_lote=None):
+    # Como medias_bootstrap_em_blocos, mas cada coluna reamostra só os anos em que ela tem valor:
+    # anos sem nenhum caso da métrica (proporção NaN) ficam de fora daquela coluna. Colunas com os
+    # mesmos anos faltantes são reamostradas juntas, com os mesmos índices (e, sem nenhum NaN, o
+    # resultado é o de medias_bootstrap_em_blocos). Uma coluna sem nenhum ano fica com médias NaN
+    valores = np.asarray(valores, dtype=np.float64)
+    por_coluna = valores.reshape(len(valores), int(np.prod(valores.shape[1:])))
+    grupos = {}  # anos presentes (bytes da máscara) -> (máscara, colunas)
+    for coluna, presentes in enumerate(~np.isnan(por_coluna.T)):
+        grupos.setdefault(presentes.tobytes(), (presentes, []))[1].append(coluna)
+
+    medias = np.full((n_boot, por_coluna.shape[1]), np.nan)
+    for presentes, colunas in grupos.values():
+        if presentes.any():
+            medias[:, colunas] = medias_bootstrap_em_blocos(por_coluna[presentes][:, colunas], n_boot, semente,
+                                                            n_processos, tamanho_lote)
+    return medias.reshape((n_boot,) + valores.shape[1:])
+
+
+def intervalos_bootstrap(m_coluna, niveis_ci=(95,), n_boot=10000, tamanho_lote=None, semente=None, n_processos=None):
+    # Média das proporções e intervalos de confiança bootstrap da média em vários níveis de
+    # confiança, todos tirados do mesmo conjunto de reamostragens: (media, {ci: (inf, sup)}).
+    # Anos sem nenhum caso da métrica (proporção NaN) ficam de fora; sem nenhum ano com casos, a
+    # média e os intervalos ficam NaN. Com n_boot acima de reamostragens_por_bloco, os blocos de
+    # reamostragens são divididos entre n_processos processos
+    m_coluna = np.asarray(m_coluna, dtype=np.float64)
+    m_coluna = m_coluna[~np.isnan(m_coluna)]
+    medias = medias_bootstrap_sem_faltantes(m_coluna, n_boot, semente, n_processos, tamanho_lote)
+    alphas = [(100 - ci) / 2 for ci in niveis_ci]
+    percentis = np.percentile(medias, alphas + [100 - alpha for alpha in alphas], overwrite_input=True)
+    media = m_coluna.mean() if len(m_coluna) else np.nan
+    return media, dict(zip(niveis_ci, zip(percentis[:len(alphas)], percentis[len(alphas):])))
+
+
+def montar_resultado(media, inf, sup, dado_observado):
+    # Estimativa do total anual e o seu intervalo a partir da média das proporções e do intervalo
+    # de confiança da média
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            "media": media,
+            "ic": (inf, sup),
+            "estimativa": dado_observado / media,
+            "intervalo_estimado": (dado_observado / sup, dado_observado / inf)
+        }
+
+
+def bootstrap_ic_proporcao(m_coluna, dado_observado, n_boot=10000, ci=95, tamanho_lote=None, semente=None,
+                           n_processos=None):
+    # Estimativa de um dado observado em um nível de confiança (ver intervalos_bootstrap)
+    media, intervalos = intervalos_bootstrap(m_coluna, (ci,), n_boot, tamanho_lote, semente, n_processos)
+    inf, sup = intervalos[ci]
+    return montar_resultado(media, inf, sup, dado_observado)
+
+
+def estimar_todos(dados_bootstrap, dados_observados, niveis_ci=(80, 90, 95, 99), n_boot=10000,
+                  tamanho_lote=None, semente=None, n_processos=None):
+    # Estimativas de todos os horizontes x métricas x níveis de confiança de uma vez, em uma tabela
+    # com uma linha por combinação. As médias de todas as combinações vêm do mesmo conjunto de
+    # reamostragens (os mesmos anos sorteados), então o custo é praticamente o de uma estimativa só;
+    # só as métricas com anos sem nenhum caso (NaN) são reamostradas à parte, sem esses anos.
+    # dados_observados: dicionário {horizonte: 4 valores} ou array com os 4 valores de cada
+    # horizonte (forma (horizontes, 4)) ou os mesmos 4 valores para todos os horizontes (forma (4,))
+    horizontes = list(dados_bootstrap)
+    if isinstance(dados_observados, dict):
+        dados_observados = [dados_observados[horizonte] for horizonte in horizontes]
+    observados = np.broadcast_to(np.asarray(dados_observados, dtype=np.float64), (len(horizontes), len(metricas)))
+
+    # Unidades amostrais (anos) x horizontes x métricas
+    valores = np.stack([np.asarray(dados_bootstrap[horizonte], dtype=np.float64) for horizonte in horizontes], axis=1)
+    medias = medias_bootstrap_sem_faltantes(valores, n_boot, semente, n_processos, tamanho_lote)
+
+    niveis_ci = np.asarray(niveis_ci, dtype=np.float64)
+    alphas = (100 - niveis_ci) / 2
+    percentis = np.percentile(medias, np.concatenate([alphas, 100 - alphas]), axis=0, overwrite_input=True)
+    # Percentis reorganizados como (horizontes, métricas, níveis)
+    inf = np.moveaxis(percentis[:len(niveis_ci)], 0, -1)
+    sup = np.moveaxis(percentis[len(niveis_ci):], 0, -1)
+    n_anos = (~np.isnan(valores)).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = np.nansum(valores, axis=0) / n_anos
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estimativa = observados / media
+        estimativa_min = observados[..., None] / sup
+        estimativa_max = observados[..., None] / inf
+
+    i_horizonte, i_metrica, i_ci = np.indices(inf.shape).reshape(3, -1)
+    return pd.DataFrame({
+        'horizonte': [horizontes[i] for i in i_horizonte],
+        'métrica': [metricas[i] for i in i_metrica],
+        'ci': niveis_ci[i_ci],
+        'dado_observado': observados[i_horizonte, i_metrica],
+        'media': media[i_horizonte, i_metrica],
+        'ic_inf': inf.ravel(),
+        'ic_sup': sup.ravel(),
+        'estimativa': estimativa[i_horizonte, i_metrica],
+        'estimativa_min': estimativa_min.ravel(),
+        'estimativa_max': estimativa_max.ravel(),
+        'n_anos': n_anos[i_horizonte, i_metrica]
+    })
+
+
+def montar_dados_bootstrap(proporcoes):
+    # Proporções m1, m2 e m3 dos anos consolidados, a partir do tensor (anos, mês, métrica) de
+    # proporções acumuladas, organizadas por horizonte para fácil acesso: {horizonte: array (anos, métricas)}
+    return {horizonte: proporcoes[:, mes - 1] for horizonte, mes in horizontes.items()}
+
+
+# Semente do gerador aleatório do bootstrap (a mesma semente reproduz os mesmos intervalos;
+# None: uma semente diferente a cada execução)
+semente_bootstrap = 0
+
+if __name__ == '__main__':
+    # Os dados para a estimativa vêm da linha de comando (para saída em JSON/CSV e outros métodos,
+    # use estimativa.py). Sem --dado, só o resumo dos dados é exibido.
+    parser = argparse.ArgumentParser(description='Resumo dos dados e estimativa do total anual por reamostragem Bootstrap.')
+    parser.add_argument('--horizonte', type=opcao(horizontes), choices=list(horizontes),
+                        help='mês até o qual os dados já foram coletados')
+    parser.add_argument('--metrica', type=opcao(metricas), choices=metricas,
+                        help='dado a estimar')
+    parser.add_argument('--dado', type=int, default=None, help='número já coletado até o horizonte')
+    parser.add_argument('--n-boot', type=inteiro_positivo, default=10000, help='nº de reamostragens')
+    parser.add_argument('--ci', type=nivel_confianca, default=95, help='nível de confiança, em %%')
+    adicionar_opcao_dados(parser)
+    parser.add_argument('--n-processos', type=inteiro_positivo, default=None, help='processos usados na agregação e no bootstrap (padrão: um por núcleo)')
+    perfil.adicionar_opcoes(parser)
+    args = parser.parse_args()
+    perfil.iniciar(args.perfil, args.cprofile)
+    if args.dado is not None and (args.horizonte is None or args.metrica is None):
+        parser.error('--dado exige --horizonte e --metrica')
+
+    # AGREGAR OS BANCOS DE DADOS EM PARALELO (OS AGREGADOS DE TODOS OS ANOS FICAM PRONTOS ANTES
+    # DA EXIBIÇÃO), UMA ÚNICA VEZ, EM DADOS
+    dados = carregar_agregados_da_linha_de_comando(parser, args)
+
+    for ano in dados.anos:
+        exibir_ano(dados.por_ano[ano], incompleto=ano in dados.anos_incompletos)
+    exibir_resumo_geral(dados)
+
+    dados_bootstrap = montar_dados_bootstrap(dados.proporcoes)
+    print('=' * 150)
+
+    # ESTIMAR
+
+    # Para estimar o total de notificações, casos confirmados e óbitos por dengue em um ano em curso com dados parciais (até o mês M), 
+    # foi construída uma estimativa com base nas proporções acumuladas em anos anteriores, utilizando intervalos de confiança para prever o 
+    # total anual com um grau de incerteza mensurado estatisticamente.
+
+    if args.dado is not None:
+        print('ESTIMAR: NÚMERO DE NOTIFICAÇÕES / NÚMERO DE CASOS CONFIRMADOS / NÚMERO DE CASOS NEGATIVOS / Nº DE ÓBITOS DO ANO INTEIRO')
+        print('COM BASE EM DADOS JÁ COLETADOS ATÉ DETERMINADO MÊS DO ANO EM QUESTÃO')
+
+        horizonte, dado = args.horizonte, args.dado
+        m = metricas.index(args.metrica) + 1
+
+        m_coluna = dados_bootstrap[horizonte][:, m-1]
+        if np.isnan(m_coluna).all():
+            parser.error(f'nenhum ano consolidado tem {args.metrica}: não há proporção para estimar')
+        with perfil.etapa('estimativa'):
+            resultado = bootstrap_ic_proporcao(m_coluna, dado, n_boot=args.n_boot, ci=args.ci, semente=semente_bootstrap,
+                                               n_processos=args.n_processos)
+
+        if m == 1:
+            print(f"\n>>> Estimativa para o nº de casos de dengue notificados, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {horizonte} constam {dado} casos notificados:")
+        elif m == 2:
+            print(f"\n>>> Estimativa para o nº de casos de dengue confirmados, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {horizonte} constam {dado} casos confirmados:")
+        elif m == 3:
+            print(f"\n>>> Estimativa para o nº de casos de dengue negativos, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {horizonte} constam {dado} casos negativos:")
         else:
-            dados_notificacao['confirmado?'].append('NÃO')
-
-
-    # Uma lista com 12 dicionários representando os meses.
-    # dentro de cada dicionário (mês), há chaves representando a divisão por faixa etária
-    # os valores das chaves são listas com três elementos, onde o primeiro simboliza
-    # o nº de notificações, o segundo o nº de casos positivos, o terceiro o nº de casos negativos e o quarto o nº de óbitos
-    info_por_mes_e_fx_et = [{cat: [0, 0, 0, 0] for cat in fx_et_completa} for _ in range(12)]
-
-
-    # Loop de contagem por mês e faixa etária
-    for i in range(len(df)):
-        data_notif = dados_notificacao['data_notificacao'][i]
-        faixa = dados_notificacao['faixa_etaria'][i]
-
-        if pd.isna(data_notif):
-            continue  # Não conta se nem a data for válida
-
-        mes_index = data_notif.month - 1
-
-        if faixa is None:
-            faixa = 'faixa_desconhecida'
-
-        # Notificações
-        info_por_mes_e_fx_et[mes_index][faixa][0] += 1
-
-        # Confirmados
-        if dados_notificacao['confirmado?'][i] == 'SIM':
-            info_por_mes_e_fx_et[mes_index][faixa][1] += 1
-        elif dados_notificacao['confirmado?'][i] == 'NÃO':
-            info_por_mes_e_fx_et[mes_index][faixa][2] += 1
-
-        # Óbitos
-        if pd.notna(dados_notificacao['data_obito'][i]):
-            mes_obito = dados_notificacao['data_obito'][i].month - 1
-            info_por_mes_e_fx_et[mes_obito][faixa][3] += 1
-
-
-    # Lista de meses
-    meses = [
-        'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
-        'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
-    ]
-
-
-    # Inicializa a lista com 12 sublistas [notificados, confirmados, negativos, óbitos] para cada mês
-    info_por_mes = [[0, 0, 0, 0] for _ in range(12)]
-
-
-    # Atualiza info_por_mes somando os valores por faixa etária para cada mês
-    for n_mes in range(12):
-        for cat in fx_et_completa:
-            info_por_mes[n_mes][0] += info_por_mes_e_fx_et[n_mes][cat][0]  # Notificados
-            info_por_mes[n_mes][1] += info_por_mes_e_fx_et[n_mes][cat][1]  # Confirmados
-            info_por_mes[n_mes][2] += info_por_mes_e_fx_et[n_mes][cat][2]  # Negativos
-            info_por_mes[n_mes][3] += info_por_mes_e_fx_et[n_mes][cat][3]  # Óbitos
-
-
-    # Exibe totais
-    print('-'*150)
-    print(f'ANO: {ano}')
-    print('-'*150)
-
-    total_notificados = sum(m[0] for m in info_por_mes)
-    total_confirmados = sum(m[1] for m in info_por_mes)
-    total_negativos = sum(m[2] for m in info_por_mes)
-    total_obitos = sum(m[3] for m in info_por_mes)
-
-    print("Total de Notificados:", total_notificados)
-    print("Total de Confirmados:", total_confirmados)
-    print("Total de Negativos:", total_negativos)
-    print("Total de Óbitos:", total_obitos)
-    print('-'*150)
-
-    proporcao_m1 = [0, 0, 0, 0]
-    proporcao_m2 = [0, 0, 0, 0]
-    proporcao_m3 = [0, 0, 0, 0]
-    for n_mes in range(3):
-        proporcao_m1[0] += info_por_mes[n_mes][0]
-        proporcao_m1[1] += info_por_mes[n_mes][1]
-        proporcao_m1[2] += info_por_mes[n_mes][2]
-        proporcao_m1[3] += info_por_mes[n_mes][3]
-    for n_mes in range(6):
-        proporcao_m2[0] += info_por_mes[n_mes][0]
-        proporcao_m2[1] += info_por_mes[n_mes][1]
-        proporcao_m2[2] += info_por_mes[n_mes][2]
-        proporcao_m2[3] += info_por_mes[n_mes][3]
-    for n_mes in range(9):
-        proporcao_m3[0] += info_por_mes[n_mes][0]
-        proporcao_m3[1] += info_por_mes[n_mes][1]
-        proporcao_m3[2] += info_por_mes[n_mes][2]
-        proporcao_m3[3] += info_por_mes[n_mes][3]
-    proporcao_m1[0] = proporcao_m1[0] / total_notificados
-    proporcao_m1[1] = proporcao_m1[1] / total_confirmados
-    proporcao_m1[2] = proporcao_m1[2] / total_negativos
-    proporcao_m1[3] = proporcao_m1[3] / total_obitos
-    proporcao_m2[0] = proporcao_m2[0] / total_notificados
-    proporcao_m2[1] = proporcao_m2[1] / total_confirmados
-    proporcao_m2[2] = proporcao_m2[2] / total_negativos
-    proporcao_m2[3] = proporcao_m2[3] / total_obitos
-    proporcao_m3[0] = proporcao_m3[0] / total_notificados
-    proporcao_m3[1] = proporcao_m3[1] / total_confirmados
-    proporcao_m3[2] = proporcao_m3[2] / total_negativos
-    proporcao_m3[3] = proporcao_m3[3] / total_obitos
-
-    if ano == 2025:
-        proporcao_m1 = [0, 0, 0, 0]
-        proporcao_m2 = [0, 0, 0, 0]
-        proporcao_m3 = [0, 0, 0, 0]
-    print(f'Proporção m1: {proporcao_m1}')
-    print(f'Proporção m2: {proporcao_m2}')
-    print(f'Proporção m3: {proporcao_m3}')
-
-    # Constrói DataFrame com todos os dados por faixa e mês
-    dados = []
-    for i, mes_dict in enumerate(info_por_mes_e_fx_et):
-        for faixa, valores in mes_dict.items():
-            dados.append({
-                "mês": meses[i],
-                "faixa_etária": faixa,
-                "confirmados": valores[1],
-                "negativos": valores[2],
-                "óbitos": valores[3]
-            })
-
-
-    df = pd.DataFrame(dados)
-    df["mês"] = pd.Categorical(df["mês"], categories=meses, ordered=True)
-    df = df.sort_values(["faixa_etária", "mês"])
-    
-    print('-'*150)
-    return ano, [info_por_mes_e_fx_et, info_por_mes, total_notificados, total_confirmados, total_negativos, total_obitos, proporcao_m1, proporcao_m2, proporcao_m3]
-
-bancos_de_dados = ['C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520190_002016.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520194_002017.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520195_002018.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520196_002019.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520197_002020.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520198_002021.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520199_002022.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520200_002023.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520201_002024.csv',
-                   'C:/Users/ABREU/Desktop/Python/requerimento_dengue/bancos_de_dados/csv/DENGON2520202_002025.csv',
-                   ]
-
-# RODAR CADA BANCO DE DADOS E ACUMULAR OS DADOS EM DADOS_GERAIS
-dados_gerais = {}
-for i in range(10):
-    ano, dados = processar_banco(bancos_de_dados[i])
-    dados_gerais[ano] = dados
-
-print('=' * 150)
-print("RESUMO GERAL DOS DADOS ACUMULADOS")
-print('=' * 150)
-
-total_notificados_geral = 0
-total_confirmados_geral = 0
-total_negativos_geral = 0
-total_obitos_geral = 0
-info_por_mes_e_fx_et_acumulado = [{cat: [0, 0, 0, 0] for cat in fx_et_completa} for _ in range(12)]
-info_por_mes_acumulado = [[0, 0, 0, 0] for _ in range(12)]
-m1 = []
-m2 = []
-m3 = []
-
-for ano, dados in sorted(dados_gerais.items()):
-    info_por_mes_e_fx_et, info_por_mes, notificados, confirmados, negativos, obitos, prop_m1, prop_m2, prop_m3 = dados
-    total_notificados_geral += notificados
-    total_confirmados_geral += confirmados
-    total_negativos_geral += negativos
-    total_obitos_geral += obitos
-    m1.append(prop_m1)
-    m2.append(prop_m2)
-    m3.append(prop_m3)
-    for n_mes in range(12):
-        for cat in fx_et_completa:
-            info_por_mes_e_fx_et_acumulado[n_mes][cat][0] += info_por_mes_e_fx_et[n_mes][cat][0]
-            info_por_mes_e_fx_et_acumulado[n_mes][cat][1] += info_por_mes_e_fx_et[n_mes][cat][1]
-            info_por_mes_e_fx_et_acumulado[n_mes][cat][2] += info_por_mes_e_fx_et[n_mes][cat][2]
-            info_por_mes_e_fx_et_acumulado[n_mes][cat][3] += info_por_mes_e_fx_et[n_mes][cat][3]
-            info_por_mes_acumulado[n_mes][0] += info_por_mes_e_fx_et[n_mes][cat][0]
-            info_por_mes_acumulado[n_mes][1] += info_por_mes_e_fx_et[n_mes][cat][1]
-            info_por_mes_acumulado[n_mes][2] += info_por_mes_e_fx_et[n_mes][cat][2]
-            info_por_mes_acumulado[n_mes][3] += info_por_mes_e_fx_et[n_mes][cat][3]
-        
-# Converte para array
-m1 = np.array(m1)
-m2 = np.array(m2)
-m3 = np.array(m3)
-
-# Organiza para fácil acesso
-dados_bootstrap = {
-    "março": m1,
-    "junho": m2,
-    "setembro": m3
-}
-
-
-print('-'*150)
-print("Info por mês e faixa etária:", info_por_mes_e_fx_et_acumulado)
-print('='*150)
-print("Info por mês:", info_por_mes_acumulado)
-print('=' * 150)
-print("TOTAIS GERAIS DE TODOS OS ANOS")
-print('=' * 150)
-print(f"Total Geral de Notificados: {total_notificados_geral}")
-print(f"Total Geral de Confirmados: {total_confirmados_geral}")
-print(f"Total Geral de Negativos: {total_negativos_geral}")
-print(f"Total Geral de Óbitos: {total_obitos_geral}")
-print('=' * 150)
-
-# ESTIMAR
-
-# Para estimar o total de notificações, casos confirmados e óbitos por dengue em um ano em curso com dados parciais (até o mês M), 
-# foi construída uma estimativa com base nas proporções acumuladas em anos anteriores, utilizando intervalos de confiança para prever o 
-# total anual com um grau de incerteza mensurado estatisticamente.
-
-print('ESTIMAR: NÚMERO DE NOTIFICAÇÕES / NÚMERO DE CASOS CONFIRMADOS / NÚMERO DE CASOS NEGATIVOS / Nº DE ÓBITOS DO ANO INTEIRO')
-print('COM BASE EM DADOS JÁ COLETADOS ATÉ DETERMINADO MÊS DO ANO EM QUESTÃO')
-
-n = 0
-while n not in (1, 2, 3):
-    print('-'*150)
-    print('Digite [1] para inserir dados (já coletados) até o fim de março (temos informações de 25 % do ano)')
-    print('Digite [2] para inserir dados (já coletados) até o fim de junho (temos informações de 50 % do ano)')
-    print('Digite [3] para inserir dados (já coletados) até o fim de setembro (temos informações de 75 % do ano)')
-    try:
-        n = int(input('Sua escolha: '))
-    except ValueError:
-        print('Entrada inválida! Digite um número de 1 a 3.\n')
-        n = 0
-
-print('Qual dado você quer estimar?')
-m = 0
-while m not in (1, 2, 3, 4):
-    print('-'*150)
-    print('Digite [1] para estimar o número de notificações')
-    print('Digite [2] para estimar o número de casos confirmados')
-    print('Digite [3] para estimar o número de casos negativos')
-    print('Digite [4] para estimar o número de óbitos')
-    try:
-        m = int(input('Sua escolha: '))
-    except ValueError:
-        print('Entrada inválida! Digite um número de 1 a 4.\n')
-        m = 0
-
-dado = int(input('Digite o número já coletado do dado que deseja estimar: '))
-
-
-nomes_meses = {1: "março", 2: "junho", 3: "setembro"}
-nomes_variaveis = {1: "notificações", 2: "confirmados", 3: "negativos", 4: "óbitos"}
-
-m_coluna = dados_bootstrap[nomes_meses[n]][:, m-1]
-resultado = bootstrap_ic_proporcao(m_coluna, dado)
-
-if m == 1:
-    print(f"\n>>> Estimativa para o nº de casos de dengue notificados, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {nomes_meses[n]} constam {dado} casos notificados:")
-elif m == 2:
-    print(f"\n>>> Estimativa para o nº de casos de dengue confirmados, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {nomes_meses[n]} constam {dado} casos confirmados:")
-elif m == 3:
-    print(f"\n>>> Estimativa para o nº de casos de dengue negativos, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {nomes_meses[n]} constam {dado} casos negativos:")
-else:
-    print(f"\n>>> Estimativa para o nº de óbitos associados a dengue, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {nomes_meses[n]} constam {dado} óbitos por dengue:")
-
-print(f"Estimativa total: {int(resultado['estimativa'])}")
-print(f"Intervalo de 95 % de confiança para o total estimado: ({int(resultado['intervalo_estimado'][0])}, {int(resultado['intervalo_estimado'][1])})\n")
+            print(f"\n>>> Estimativa para o nº de óbitos associados a dengue, assumindo que o parâmetro m\n foi obtido por reamostragem Bootstrap e que até {horizonte} constam {dado} óbitos por dengue:")
+
+        print(f"Estimativa total: {int(resultado['estimativa'])}")
+        print(f"Intervalo de {args.ci:g} % de confiança para o total estimado: ({int(resultado['intervalo_estimado'][0])}, {int(resultado['intervalo_estimado'][1])})\n")
+
+    perfil.finalizar()
@@ -0,0 +1,79 @@
+import struct
+
+import numpy as np
+import pandas as pd
+
+# Leitor de arquivos .dbf (dBase III, formato das exportações do SINAN), lido em blocos de
+# registros. Só os campos pedidos são decodificados: cada bloco é interpretado com um dtype
+# estruturado do NumPy que aponta direto para as posições desses campos dentro do registro.
+
+# Código de idioma (byte 29 do cabeçalho) -> codificação. Sem código, vale a do DOS (cp850).
+codificacoes_dbf = {0x01: 'cp437', 0x02: 'cp850', 0x03: 'cp1252', 0x57: 'cp1252', 0x64: 'cp852'}
+codificacao_padrao = 'cp850'
+
+
+def ler_cabecalho_dbf(arquivo):
+    # Devolve o nº de registros, o tamanho do cabeçalho, o tamanho de cada registro,
+    # a codificação e os campos {nome: (tipo, deslocamento no registro, tamanho)}
+    cabecalho = arquivo.read(32)
+    n_registros, tamanho_cabecalho, tamanho_registro = struct.unpack('<IHH', cabecalho[4:12])
+    codificacao = codificacoes_dbf.get(cabecalho[29], codificacao_padrao)
+
+    campos = {}
+    deslocamento = 1  # O 1º byte de cada registro é a marca de exclusão ('*')
+    while True:
+        descritor = arquivo.read(32)
+        if len(descritor) < 32 or descritor[0] == 0x0D:  # 0x0D encerra a lista de campos
+            break
+        nome = descritor[:11].split(b'\0')[0].decode('ascii').strip()
+        tipo = chr(descritor[11])
+        tamanho = descritor[16]
+        campos[nome] = (tipo, deslocamento, tamanho)
+        deslocamento += tamanho
+
+    return n_registros, tamanho_cabecalho, tamanho_registro, codificacao, campos
+
+
+def decodificar_campo(valores, tipo, codificacao):
+    # Datas ('D') vêm como AAAAMMDD (ou em branco); números ('N'/'F') viram float;
+    # os demais campos viram texto sem os espaços de preenchimento
+    texto = np.char.strip(np.char.decode(valores, codificacao))
+    if tipo == 'D':
+        return pd.to_datetime(texto, format='%Y%m%d', errors='coerce')
+    if tipo in ('N', 'F'):
+        return pd.to_numeric(texto, errors='coerce')
+    return texto
+
+
+def ler_blocos_dbf(caminho_dbf, colunas, registros_por_bloco=100_000, codificacao=None):
+    # Gera um DataFrame por bloco de até registros_por_bloco registros, com as colunas pedidas.
+    # Registros marcados como excluídos são descartados.
+    with open(caminho_dbf, 'rb') as arquivo:
+        n_registros, tamanho_cabecalho, tamanho_registro, codificacao_arquivo, campos = ler_cabecalho_dbf(arquivo)
+        codificacao = codificacao or codificacao_arquivo
+
+        faltando = [col for col in colunas if col not in campos]
+        if faltando:
+            raise ValueError(f'Campos ausentes em {caminho_dbf}: {faltando}')
+
+        tipo_registro = np.dtype({
+            'names': ['_exclusao'] + list(colunas),
+            'formats': ['S1'] + [f'S{campos[col][2]}' for col in colunas],
+            'offsets': [0] + [campos[col][1] for col in colunas],
+            'itemsize': tamanho_registro
+        })
+
+        arquivo.seek(tamanho_cabecalho)
+        restantes = n_registros
+        while restantes > 0:
+            bloco = arquivo.read(min(registros_por_bloco, restantes) * tamanho_registro)
+            n = len(bloco) // tamanho_registro
+            if n == 0:
+                break  # Arquivo truncado
+            registros = np.frombuffer(bloco, dtype=tipo_registro, count=n)
+            registros = registros[registros['_exclusao'] != b'*']
+            yield pd.DataFrame({
+                col: decodificar_campo(registros[col], campos[col][0], codificacao)
+                for col in colunas
+            })
+            restantes -= n
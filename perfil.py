@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import cProfile
+import platform
+import contextlib
+import tracemalloc
+from datetime import datetime
+
+# Perfil opcional das etapas do processamento (leitura, tratamento de tipos, idade e faixa etária,
+# classificação, contagem, redução, impressão, renderização e estimativa). Desligado por padrão:
+# etapa() não mede nada enquanto iniciar() não for chamada. Ligado (--perfil/--cprofile nos
+# scripts), cada etapa registra o tempo, as linhas por segundo e a memória alocada (tracemalloc),
+# e finalizar() grava um relatório JSON da execução e, opcionalmente, o dump do cProfile.
+# Com o perfil ligado, agregação e renderização rodam no processo atual, para que as medições
+# dos processos auxiliares não se percam.
+
+ativo = False
+chamadas = []
+
+caminho_relatorio = None
+caminho_cprofile = None
+perfilador = None
+inicio_execucao = None
+
+# Pico de memória já observado em cada etapa aberta (etapas podem ser aninhadas, ex.: o
+# tratamento de tipos acontece dentro da leitura, e cada uma zera o pico do tracemalloc)
+picos_abertos = []
+
+
+def adicionar_opcoes(parser):
+    # Opções de perfil comuns aos scripts
+    parser.add_argument('--perfil', default=None, metavar='RELATORIO.json',
+                        help='mede cada etapa (tempo, linhas/s, memória alocada) e salva o relatório em JSON')
+    parser.add_argument('--cprofile', default=None, metavar='ARQUIVO.prof',
+                        help='salva também o perfil do cProfile (abrir com python -m pstats ou snakeviz)')
+
+
+def iniciar(relatorio=None, arquivo_cprofile=None):
+    # Liga o perfil se algum dos arquivos de saída for pedido
+    global ativo, caminho_relatorio, caminho_cprofile, perfilador, inicio_execucao
+    if relatorio is None and arquivo_cprofile is None:
+        return
+    ativo = True
+    caminho_relatorio, caminho_cprofile = relatorio, arquivo_cprofile
+    chamadas.clear()
+    if relatorio is not None and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if arquivo_cprofile is not None:
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+    inicio_execucao = time.perf_counter()
+
+
+@contextlib.contextmanager
+def etapa(nome, linhas=None):
+    # Mede o bloco with. O registro devolvido pode receber o nº de linhas depois de conhecido:
+    #   with etapa('leitura') as registro:
+    #       df = ...
+    #       registro['linhas'] = len(df)
+    registro = {'etapa': nome, 'linhas': linhas}
+    if not ativo:
+        yield registro
+        return
+
+    memoria = tracemalloc.is_tracing()
+    if memoria:
+        memoria_inicial, pico = tracemalloc.get_traced_memory()
+        if picos_abertos:
+            picos_abertos[-1] = max(picos_abertos[-1], pico)
+        tracemalloc.reset_peak()
+    picos_abertos.append(0)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['segundos'] = time.perf_counter() - inicio
+        pico_interno = picos_abertos.pop()
+        if memoria:
+            memoria_final, pico = tracemalloc.get_traced_memory()
+            pico = max(pico, pico_interno)
+            if picos_abertos:
+                picos_abertos[-1] = max(picos_abertos[-1], pico)
+            registro['alocado_mb'] = (memoria_final - memoria_inicial) / 2**20
+            registro['pico_mb'] = (pico - memoria_inicial) / 2**20
+        registro['nivel'] = len(picos_abertos)
+        chamadas.append(registro)
+
+
+def resumir(registros):
+    # Totais por etapa, na ordem em que cada etapa apareceu pela primeira vez. O tempo de uma
+    # etapa inclui o das etapas aninhadas nela (nivel maior)
+    etapas = {}
+    for registro in registros:
+        resumo = etapas.setdefault(registro['etapa'], {
+            'etapa': registro['etapa'], 'nivel': registro['nivel'], 'chamadas': 0, 'segundos': 0.0, 'linhas': None,
+            'linhas_por_segundo': None, 'alocado_mb': None, 'pico_mb': None
+        })
+        resumo['chamadas'] += 1
+        resumo['segundos'] += registro['segundos']
+        if registro['linhas'] is not None:
+            resumo['linhas'] = (resumo['linhas'] or 0) + registro['linhas']
+        if 'alocado_mb' in registro:
+            resumo['alocado_mb'] = (resumo['alocado_mb'] or 0) + registro['alocado_mb']
+            resumo['pico_mb'] = max(resumo['pico_mb'] or 0, registro['pico_mb'])
+    for resumo in etapas.values():
+        if resumo['linhas'] and resumo['segundos'] > 0:
+            resumo['linhas_por_segundo'] = resumo['linhas'] / resumo['segundos']
+    return list(etapas.values())
+
+
+def finalizar():
+    # Grava o relatório JSON e o dump do cProfile pedidos em iniciar() e desliga o perfil
+    global ativo, perfilador
+    if not ativo:
+        return
+    segundos_total = time.perf_counter() - inicio_execucao
+    if perfilador is not None:
+        perfilador.disable()
+        perfilador.dump_stats(caminho_cprofile)
+        perfilador = None
+
+    if caminho_relatorio is not None:
+        relatorio = {
+            'script': os.path.basename(sys.argv[0]),
+            'argumentos': sys.argv[1:],
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'segundos_total': segundos_total,
+            'etapas': resumir(chamadas),
+            'chamadas': chamadas
+        }
+        with open(caminho_relatorio, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=1, ensure_ascii=False)
+        tracemalloc.stop()
+    ativo = False
@@ -0,0 +1,713 @@
+import os
+import re
+import glob
+import zlib
+import unicodedata
+from collections import namedtuple
+from types import MappingProxyType
+from importlib.util import find_spec
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from leitor_dbf import ler_blocos_dbf
+import perfil
+
+# Regras de confirmação de um caso: (coluna do SINAN, códigos que confirmam o caso).
+# Basta uma regra ser satisfeita para o caso ser confirmado. Para acrescentar um critério
+# (ex.: CRITERIO, SOROTIPO), basta acrescentar uma linha; a coluna passa a ser lida automaticamente.
+regras_confirmacao = [
+    ('CLASSI_FIN', [10, 11, 12]),  # Dengue, dengue com sinais de alarme, dengue grave
+    ('RESUL_SORO', [1]),           # Sorologia reagente
+    ('RESUL_NS1', [1]),            # NS1 positivo
+    ('RESUL_PCR_', [1]),           # RT-PCR positivo
+]
+
+# Códigos (int8) da coluna 'confirmado?'
+confirmado_sim = 1
+confirmado_nao = 0
+confirmado_desconhecido = -1
+
+# Das ~150 colunas do SINAN, apenas estas são usadas na análise
+colunas_datas = ['DT_NOTIFIC', 'DT_NASC', 'DT_OBITO']
+colunas_numericas = list(dict.fromkeys(coluna for coluna, _ in regras_confirmacao))
+colunas_usadas = colunas_datas + colunas_numericas
+
+# Os códigos de resultado/classificação são lidos como float por causa dos campos vazios (NaN)
+tipos_colunas = {col: 'float64' for col in colunas_numericas}
+
+# Diretório dos bancos de dados: opção --dados dos scripts, variável de ambiente DENGUE_DADOS ou,
+# na falta das duas, "Banco de dados"
+variavel_diretorio_dados = 'DENGUE_DADOS'
+diretorio_dados_padrao = 'Banco de dados'
+
+# Bancos anuais exportados do SINAN (DENGON..._00<ano>) e formatos aceitos, do mais rápido para o
+# mais lento de ler. Quando o mesmo banco existe em mais de um formato, usa-se o mais rápido.
+padrao_banco = re.compile(r'DENGON.*_00(\d{4})\.(parquet|csv|dbf)', re.IGNORECASE)
+ordem_formatos = ['parquet', 'csv', 'dbf']
+
+# Tamanho dos blocos de leitura: a memória usada na agregação não cresce com o tamanho do arquivo
+linhas_por_bloco_padrao = 200_000
+
+fx_et = ['4 anos ou menos', 'entre 5 e 9', 'entre 10 e 14', 'entre 15 e 19', 'entre 20 e 29', 'entre 30 e 39', 
+    'entre 40 e 49', 'entre 50 e 59', 'entre 60 e 69', 'entre 70 e 79', '80 anos ou mais']
+fx_et_completa = fx_et + ['faixa_desconhecida']
+
+# Métricas do último eixo do cubo de contagens
+metricas = ['notificados', 'confirmados', 'negativos', 'óbitos']
+
+# Horizontes das estimativas: dados acumulados até o fim de março, junho e setembro
+horizontes = {'março': 3, 'junho': 6, 'setembro': 9}
+meses_horizontes = np.array(list(horizontes.values())) - 1
+
+# Semanas epidemiológicas de um ano (52 ou 53; anos com 52 semanas têm a 53ª vazia)
+n_semanas = 53
+
+# Períodos do cubo semanal de um banco: as semanas 1 a 53 do ano epidemiológico do banco, entre um
+# período com as notificações de anos epidemiológicos anteriores (ex.: os primeiros dias de janeiro
+# que ainda pertencem à última semana do ano anterior) e outro com as de anos posteriores (ex.: os
+# últimos dias de dezembro que já pertencem à semana 1 do ano seguinte). O índice de cada semana
+# no cubo é o próprio nº da semana, o mesmo de SEM_NOT.
+n_periodos_semanais = n_semanas + 2
+
+# Semanas finais do ano sem nenhuma notificação a partir das quais o banco anual é considerado
+# incompleto (ver ano_incompleto)
+semanas_sem_notificacao = 4
+
+# Limites (inclusivos) de idade de cada faixa etária, de '4 anos ou menos' até '80 anos ou mais'
+limites_fx_et = [-np.inf, 4, 9, 14, 19, 29, 39, 49, 59, 69, 79, np.inf]
+
+
+def carregar_banco(caminho_csv, colunas_extras=()):
+    # O banco inteiro em um DataFrame, já com os tipos tratados: os blocos de ler_blocos_banco
+    # concatenados, para que a leitura de cada formato exista em um só lugar
+    return pd.concat(ler_blocos_banco(caminho_csv, colunas_extras=colunas_extras), ignore_index=True)
+
+
+def tratar_tipos(df):
+    # Registros preenchidos incorretamente viram nulos (NaT e NaN), como antes
+    with perfil.etapa('tipos', len(df)):
+        for col in colunas_datas:
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], format="%Y-%m-%d", errors="coerce")
+        for col in colunas_numericas:
+            if df[col].dtype != 'float64':
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+
+    return df
+
+
+def calcular_idades(data_nasc, data_notif):
+    # Idade (em anos completos) no momento da notificação, para todas as linhas de uma vez.
+    # Desconta um ano de quem ainda não fez aniversário no ano da notificação; a comparação
+    # mês*100 + dia equivale à comparação de tuplas (mês, dia), inclusive para nascidos em 29/02.
+    idade = data_notif.dt.year - data_nasc.dt.year
+    aniversario_pendente = (data_notif.dt.month * 100 + data_notif.dt.day) < (data_nasc.dt.month * 100 + data_nasc.dt.day)
+    idade = idade - aniversario_pendente.astype(int)
+    # Datas nulas resultam em idade nula (<NA>)
+    return idade.astype('Int64')
+
+
+def obter_faixas_etarias(idades):
+    # Enquadra as idades nas faixas de fx_et; idades nulas vão para 'faixa_desconhecida'
+    faixas = pd.cut(idades.astype('float64'), bins=limites_fx_et, labels=fx_et, right=True)
+    faixas = faixas.cat.add_categories(['faixa_desconhecida'])
+    return faixas.fillna('faixa_desconhecida')
+
+
+def classificar_confirmacao(df, regras=regras_confirmacao):
+    # Classifica todas as notificações de uma vez, a partir de máscaras booleanas:
+    # SIM se alguma regra é satisfeita, desconhecido se todas as colunas das regras
+    # estão vazias (NaN) e NÃO nos demais casos.
+    confirmado = np.zeros(len(df), dtype=bool)
+    sem_informacao = np.ones(len(df), dtype=bool)
+    for coluna, codigos in regras:
+        confirmado |= df[coluna].isin(codigos).to_numpy()
+        sem_informacao &= df[coluna].isna().to_numpy()
+
+    resultado = np.full(len(df), confirmado_nao, dtype=np.int8)
+    resultado[confirmado] = confirmado_sim
+    resultado[sem_informacao] = confirmado_desconhecido
+    return resultado
+
+
+def semana_epidemiologica(datas):
+    # Ano e semana epidemiológica de cada data (as mesmas de SEM_NOT/SEM_PRI do SINAN): as semanas
+    # começam no domingo e pertencem ao ano em que cai a sua quarta-feira, isto é, ao ano que tem
+    # 4 ou mais dos seus dias
+    inicio = datas - pd.to_timedelta((datas.dt.weekday + 1) % 7, unit='D')
+    quarta = inicio + pd.Timedelta(days=3)
+    return quarta.dt.year, (quarta.dt.dayofyear - 1) // 7 + 1
+
+
+def indices_semana(datas, ano_base, n_anos):
+    # Índice da semana epidemiológica (ano epidemiológico, semana) de cada data (não nula) em uma
+    # sequência de n_anos blocos de n_semanas semanas, um por ano epidemiológico a partir de ano_base,
+    # entre um período para as datas de anos epidemiológicos anteriores (índice 0) e outro para as de
+    # anos posteriores (índice n_anos * n_semanas + 1):
+    # (ano epidemiológico - ano_base) * n_semanas + semana
+    ano_epi, semana = semana_epidemiologica(datas)
+    ano_epi = ano_epi.to_numpy().astype(np.int64)
+    indices = (ano_epi - ano_base) * n_semanas + semana.to_numpy().astype(np.int64)
+    indices[ano_epi < ano_base] = 0
+    indices[ano_epi >= ano_base + n_anos] = n_anos * n_semanas + 1
+    return indices
+
+
+def contar_por_periodo_e_faixa(df, faixas_etarias, confirmacao):
+    # Cubo de contagens com eixos (mês, faixa etária, métrica) e cubos (semana epidemiológica,
+    # faixa etária, métrica) por ano epidemiológico, em um dicionário {ano epidemiológico: cubo},
+    # onde as métricas são [notificados, confirmados, negativos, óbitos], na ordem de metricas. Cada
+    # contagem vira um índice linear período*48 + faixa*4 + métrica (os índices semanais vêm depois
+    # dos 12 meses) e todos os cubos saem de um único np.bincount. Notificações sem data válida
+    # não são contadas e os óbitos entram no mês e na semana do óbito, na faixa etária do paciente.
+    valido = df['DT_NOTIFIC'].notna().to_numpy()
+    faixa = faixas_etarias.cat.codes.to_numpy()[valido].astype(np.int64)
+    confirmacao = confirmacao[valido]
+    data_notif = df['DT_NOTIFIC'][valido]
+    data_obito = df['DT_OBITO'][valido]
+    com_obito = data_obito.notna().to_numpy()
+    data_obito = data_obito[com_obito]
+
+    n_faixas = len(fx_et_completa)
+    n_metricas = len(metricas)
+    tamanho_periodo = n_faixas * n_metricas
+    inicio_semanas = 12 * tamanho_periodo
+
+    mes = data_notif.dt.month.to_numpy().astype(np.int64) - 1
+    mes_obito = data_obito.dt.month.to_numpy().astype(np.int64) - 1
+    # Só os anos epidemiológicos em torno do ano de notificação mais frequente do bloco (o candidato
+    # a ano do banco, ±1) são contados semana a semana; as datas mais distantes (ex.: anos digitados
+    # errado, como 0202 ou 9999) vão para um período antes e outro depois deles. Assim a contagem de
+    # um bloco nunca passa de 3 * n_semanas + 2 períodos semanais, por mais espalhadas que sejam as
+    # datas.
+    n_anos_epi = 3
+    ano_base = int(data_notif.dt.year.mode().iloc[0]) - 1 if len(data_notif) else 0
+    semana = 12 + indices_semana(data_notif, ano_base, n_anos_epi)
+    semana_obito = 12 + indices_semana(data_obito, ano_base, n_anos_epi)
+
+    indices = []
+    for periodo, periodo_obito in ((mes, mes_obito), (semana, semana_obito)):
+        base = periodo * tamanho_periodo + faixa * n_metricas
+        indices += [
+            base,                                                          # Notificações
+            base[confirmacao == confirmado_sim] + 1,                       # Confirmados
+            base[confirmacao == confirmado_nao] + 2,                       # Negativos
+            periodo_obito * tamanho_periodo + faixa[com_obito] * n_metricas + 3  # Óbitos
+        ]
+    contagens = np.bincount(np.concatenate(indices), minlength=(12 + n_anos_epi * n_semanas + 2) * tamanho_periodo).astype(np.int64)
+    cubo = contagens[:inicio_semanas].reshape(12, n_faixas, n_metricas)
+    semanas = contagens[inicio_semanas:].reshape(n_anos_epi * n_semanas + 2, n_faixas, n_metricas)
+    cubos_semanais = {ano_base + i: semanas[1 + i * n_semanas:1 + (i + 1) * n_semanas] for i in range(n_anos_epi)}
+
+    # Os dois períodos de fora entram como os anos epidemiológicos vizinhos da janela, com tudo na
+    # 1ª semana: cubo_semanal_do_ano os soma nos períodos das pontas, já que o ano do banco (o de
+    # notificação mais frequente do arquivo todo) fica dentro da janela de cada bloco
+    for ano_epi, periodo in ((ano_base - 1, 0), (ano_base + n_anos_epi, -1)):
+        fora = np.zeros((n_semanas, n_faixas, n_metricas), dtype=np.int64)
+        fora[0] = semanas[periodo]
+        cubos_semanais[ano_epi] = fora
+    return cubo, cubos_semanais
+
+
+def cubo_semanal_do_ano(cubos_por_ano_epi, ano):
+    # Cubo semanal (período semanal, faixa etária, métrica) do banco do ano, a partir dos cubos de
+    # cada ano epidemiológico: as semanas do ano epidemiológico do banco e, nos períodos das
+    # pontas, as contagens dos anos epidemiológicos anteriores e posteriores (ver n_periodos_semanais)
+    cubo_semanal = np.zeros((n_periodos_semanais, len(fx_et_completa), len(metricas)), dtype=np.int64)
+    for ano_epi, semanas in cubos_por_ano_epi.items():
+        if ano_epi == ano:
+            cubo_semanal[1:-1] += semanas
+        elif ano_epi < ano:
+            cubo_semanal[0] += semanas.sum(axis=0)
+        else:
+            cubo_semanal[-1] += semanas.sum(axis=0)
+    return cubo_semanal
+
+
+def cubo_para_dicts(cubo):
+    # Adaptador para o formato antigo usado pelas tabelas e gráficos: uma lista com 12
+    # dicionários (meses), cada um com as faixas etárias como chaves e listas
+    # [notificados, confirmados, negativos, óbitos] como valores. Com o cubo semanal, a lista
+    # tem um dicionário por semana epidemiológica.
+    return [dict(zip(fx_et_completa, mes)) for mes in cubo.tolist()]
+
+
+def proporcoes_acumuladas_por_periodo(contagens):
+    # Proporção do total anual de cada métrica acumulada até o fim de cada período (mês ou semana):
+    # array (períodos, métricas), a partir do cubo mensal ou semanal (períodos, faixas, métricas).
+    # Uma soma acumulada só, para todos os períodos; a métrica sem nenhum caso no ano (ex.: nenhum
+    # óbito) não tem proporção definida e fica como NaN em todos os períodos
+    por_periodo = contagens.sum(axis=1)
+    acumulado = por_periodo.cumsum(axis=0)
+    total = por_periodo.sum(axis=0)
+    return np.divide(acumulado, total, out=np.full(acumulado.shape, np.nan), where=total > 0)
+
+
+def semanas_no_ano(ano):
+    # Nº de semanas epidemiológicas do ano (52 ou 53): 28/12 sempre cai na última delas
+    return int(semana_epidemiologica(pd.Series([pd.Timestamp(ano, 12, 28)]))[1].iloc[0])
+
+
+def ano_incompleto(ano, cubo_semanal):
+    # Um banco é incompleto (ano em curso, exportado antes do fim do ano) quando as últimas
+    # semanas_sem_notificacao semanas do seu ano epidemiológico não têm nenhuma notificação. Os
+    # registros de outros anos epidemiológicos ficam nos períodos das pontas do cubo semanal (ver
+    # n_periodos_semanais), então não contam como cobertura. A cobertura vem dos próprios dados,
+    # então o ano em curso é reconhecido sem precisar ser informado.
+    notificados = cubo_semanal[:, :, metricas.index('notificados')].sum(axis=1)
+    ultima = semanas_no_ano(ano)
+    return not notificados[ultima - semanas_sem_notificacao + 1:ultima + 1].any()
+
+
+def posicao_no_ano(data, resolucao='semana'):
+    # Posição contínua de uma data de corte no eixo de períodos: o nº de períodos semanais (ver
+    # n_periodos_semanais) ou de meses já completos mais a fração transcorrida da semana (ou do mês)
+    # da data. Ex.: 31/03 -> 3.0 em meses; 15/04 -> 3.5.
+    data = pd.Timestamp(data)
+    if resolucao == 'mes':
+        return data.month - 1 + data.day / data.days_in_month
+    ano_epi, semana = semana_epidemiologica(pd.Series([data]))
+    # Dias de janeiro da última semana do ano anterior (ou de dezembro na semana 1 do seguinte)
+    # ficam no período das pontas, como em cubo_semanal_do_ano
+    if ano_epi[0] < data.year:
+        periodo = 0
+    elif ano_epi[0] > data.year:
+        periodo = n_semanas + 1
+    else:
+        periodo = semana[0]
+    return periodo + ((data.weekday() + 1) % 7 + 1) / 7
+
+
+def interpolar_proporcoes(proporcoes, posicao):
+    # Interpola linearmente as proporções acumuladas (..., períodos, métricas) em uma posição
+    # contínua do eixo de períodos (0 = início do ano, n_períodos = fim do ano)
+    acumulado = np.concatenate([np.zeros_like(proporcoes[..., :1, :]), proporcoes], axis=-2)
+    posicao = min(max(posicao, 0.0), proporcoes.shape[-2])
+    i = min(int(posicao), proporcoes.shape[-2] - 1)
+    fracao = posicao - i
+    return acumulado[..., i, :] + fracao * (acumulado[..., i + 1, :] - acumulado[..., i, :])
+
+
+def sem_acentos(texto):
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii').lower()
+
+
+def opcao(opcoes):
+    # Tipo de argumento de linha de comando que aceita uma das opções com ou sem acentos
+    # (ex.: 'óbitos' ou 'obitos', 'março' ou 'marco') e devolve a opção original
+    por_nome = {sem_acentos(nome): nome for nome in opcoes}
+
+    def converter(texto):
+        if sem_acentos(texto) not in por_nome:
+            raise ValueError(texto)
+        return por_nome[sem_acentos(texto)]
+    converter.__name__ = 'opção'
+    return converter
+
+
+def inteiro_positivo(texto):
+    # Tipo de argumento de linha de comando para contagens (ex.: --n-boot, --n-processos): inteiro > 0
+    valor = int(texto)
+    if valor <= 0:
+        raise ValueError(texto)
+    return valor
+
+
+def nivel_confianca(texto):
+    # Tipo de argumento de linha de comando para o nível de confiança, em %: estritamente entre 0 e 100
+    valor = float(texto)
+    if not 0 < valor < 100:
+        raise ValueError(texto)
+    return valor
+
+
+inteiro_positivo.__name__ = 'inteiro positivo'
+nivel_confianca.__name__ = 'nível de confiança (entre 0 e 100)'
+
+
+def ler_blocos_banco(caminho_csv, linhas_por_bloco=linhas_por_bloco_padrao, tipos=tipos_colunas, colunas_extras=()):
+    # Gera o banco em blocos de até linhas_por_bloco linhas, já com os tipos tratados,
+    # para que nunca seja preciso ter o arquivo inteiro em memória
+    colunas = colunas_usadas + list(colunas_extras)
+
+    if os.path.isdir(caminho_csv):
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        diretorio, particao = os.path.split(os.path.normpath(caminho_csv))
+        ano = int(particao.split('=', 1)[1])
+        dataset = ds.dataset(diretorio, format='parquet', partitioning='hive', filesystem=fs.LocalFileSystem(use_mmap=True))
+        for lote in dataset.to_batches(columns=colunas, filter=ds.field('NU_ANO') == ano, batch_size=linhas_por_bloco):
+            yield tratar_tipos(lote.to_pandas())
+
+    elif caminho_csv.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(caminho_csv, memory_map=True).iter_batches(batch_size=linhas_por_bloco, columns=colunas):
+            yield tratar_tipos(lote.to_pandas())
+
+    elif caminho_csv.lower().endswith('.dbf'):
+        for df in ler_blocos_dbf(caminho_csv, colunas, registros_por_bloco=linhas_por_bloco):
+            yield tratar_tipos(df)
+
+    else:
+        # Algum código não numérico no arquivo faz a leitura com tipos fixos falhar: o arquivo é
+        # relido a partir do bloco em que isso aconteceu, com os códigos como texto (convertidos
+        # em tratar_tipos). Os blocos já entregues não são lidos de novo.
+        linhas_lidas = 0
+        with pd.read_csv(
+            caminho_csv,
+            usecols=colunas,
+            dtype=tipos,
+            parse_dates=colunas_datas,
+            date_format="%Y-%m-%d",
+            chunksize=linhas_por_bloco
+        ) as leitor:
+            while True:
+                try:
+                    df = next(leitor, None)
+                except ValueError:
+                    if tipos is str:
+                        raise
+                    break
+                if df is None:
+                    return
+                linhas_lidas += len(df)
+                yield tratar_tipos(df)
+
+        with pd.read_csv(
+            caminho_csv,
+            usecols=colunas,
+            dtype=str,
+            skiprows=range(1, linhas_lidas + 1),
+            chunksize=linhas_por_bloco
+        ) as leitor:
+            for df in leitor:
+                yield tratar_tipos(df)
+
+
+def mais_recente_ou_igual(convertido, origem):
+    # Um arquivo convertido (Parquet) só vale enquanto não for mais antigo que o seu arquivo de
+    # origem: um banco reenviado com o mesmo nome torna a conversão antiga obsoleta
+    return os.stat(convertido).st_mtime_ns >= os.stat(origem).st_mtime_ns
+
+
+def diretorio_de_dados(diretorio=None):
+    # O diretório pedido ou, na falta dele, o da variável de ambiente ou o padrão
+    return diretorio or os.environ.get(variavel_diretorio_dados) or diretorio_dados_padrao
+
+
+def encontrar_bancos(diretorio=None):
+    # Caminhos dos bancos anuais do diretório (um por banco, no formato mais rápido disponível),
+    # em ordem de ano. Todos os bancos encontrados são usados, sem número fixo de anos.
+    diretorio = diretorio_de_dados(diretorio)
+    formatos = [formato for formato in ordem_formatos if formato != 'parquet' or find_spec('pyarrow')]
+
+    candidatos = {}  # nome sem extensão -> [(posição do formato, ano, caminho), ...]
+    for nome in os.listdir(diretorio):
+        encontrado = padrao_banco.fullmatch(nome)
+        if encontrado and encontrado[2].lower() in formatos:
+            candidato = (formatos.index(encontrado[2].lower()), int(encontrado[1]), os.path.join(diretorio, nome))
+            candidatos.setdefault(os.path.splitext(nome)[0], []).append(candidato)
+
+    # De cada banco, o formato mais rápido; um .parquet avulso só se não for mais antigo que o
+    # .csv/.dbf de mesmo nome (senão o banco foi reenviado depois da conversão)
+    bancos = {}  # nome sem extensão -> (posição do formato, ano, caminho)
+    origens = {}  # nome sem extensão -> caminho do .csv/.dbf mais rápido (ou do .parquet, sem outro)
+    for base, opcoes in candidatos.items():
+        opcoes.sort()
+        originais = [opcao for opcao in opcoes if opcao[2].lower().endswith(('.csv', '.dbf'))]
+        origens[base] = (originais or opcoes)[0][2]
+        if originais and opcoes[0] not in originais and not mais_recente_ou_igual(opcoes[0][2], origens[base]):
+            bancos[base] = originais[0]
+        else:
+            bancos[base] = opcoes[0]
+
+    # Conjunto Parquet gerado por conversao_parquet.py: como cada partição NU_ANO=<ano> mistura
+    # registros de vários arquivos, ele só substitui os arquivos se todos tiverem sido convertidos
+    # depois da última entrega de cada um e se nenhum dos arquivos convertidos tiver sido removido
+    # do diretório depois da conversão
+    particoes = sorted(glob.glob(os.path.join(diretorio, 'parquet', 'NU_ANO=*')))
+    if 'parquet' in formatos and particoes:
+        convertidos = {}  # nome do banco de origem -> arquivos gravados a partir dele
+        for particao in particoes:
+            for arquivo in glob.glob(os.path.join(particao, '*.parquet')):
+                convertidos.setdefault(os.path.basename(arquivo).rsplit('-', 1)[0], []).append(arquivo)
+        if convertidos.keys() <= origens.keys() and \
+                all(base in convertidos and all(mais_recente_ou_igual(arquivo, origem) for arquivo in convertidos[base])
+                    for base, origem in origens.items()):
+            return particoes
+
+    return [caminho for _, _, caminho in sorted(bancos.values(), key=lambda banco: (banco[1], banco[2]))]
+
+
+def agregar_blocos(blocos, origem='banco'):
+    # Soma a contagem de cada bloco aos cubos mensal (mês, faixa etária, métrica) e semanal
+    # (período semanal, faixa etária, métrica) e devolve o AgregadoAnual do banco. Além dos
+    # cubos, só a contagem de notificações por ano é mantida entre um bloco e outro.
+    cubo = np.zeros((12, len(fx_et_completa), len(metricas)), dtype=np.int64)
+    cubos_semanais = {}  # ano epidemiológico -> cubo (semana, faixa etária, métrica)
+    contagem_anos = pd.Series(dtype='float64')
+
+    blocos = iter(blocos)
+    while True:
+        # A leitura do bloco acontece no next (o tratamento de tipos é medido dentro dela)
+        with perfil.etapa('leitura') as registro:
+            df = next(blocos, None)
+            registro['linhas'] = None if df is None else len(df)
+        if df is None:
+            break
+        n = len(df)
+
+        # Idade e faixa etária no momento da notificação, confirmação e contagem
+        with perfil.etapa('idade e faixa etária', n):
+            faixas_etarias = obter_faixas_etarias(calcular_idades(df['DT_NASC'], df['DT_NOTIFIC']))
+        with perfil.etapa('classificação', n):
+            confirmacao = classificar_confirmacao(df)
+        with perfil.etapa('contagem', n):
+            cubo_bloco, cubos_semanais_bloco = contar_por_periodo_e_faixa(df, faixas_etarias, confirmacao)
+        with perfil.etapa('redução', n):
+            contagem_anos = contagem_anos.add(df['DT_NOTIFIC'].dt.year.value_counts(), fill_value=0)
+            cubo += cubo_bloco
+            for ano_epi, cubo_semanal in cubos_semanais_bloco.items():
+                cubos_semanais[ano_epi] = cubos_semanais.get(ano_epi, 0) + cubo_semanal
+
+    if contagem_anos.empty:
+        raise ValueError(f'Nenhuma notificação com DT_NOTIFIC válida em {origem}')
+
+    # Ano do banco de dados: o ano de notificação mais frequente (o menor, em caso de empate)
+    ano = int(contagem_anos[contagem_anos == contagem_anos.max()].index.min())
+    with perfil.etapa('processamento do ano'):
+        return AgregadoAnual(ano, cubo, cubo_semanal_do_ano(cubos_semanais, ano))
+
+
+def agregar_banco(caminho_csv, linhas_por_bloco=linhas_por_bloco_padrao):
+    # Lê um banco anual em blocos e devolve o seu AgregadoAnual, com os cubos de contagens mensal
+    # (mês, faixa etária, métrica) e semanal (período semanal, faixa etária, métrica; ver
+    # n_periodos_semanais). A memória usada depende do tamanho do bloco, não do tamanho do arquivo.
+    return agregar_blocos(ler_blocos_banco(caminho_csv, linhas_por_bloco), caminho_csv)
+
+
+def agregar_bancos(caminhos, n_processos=None, agregar=agregar_banco, consultar=None):
+    # Agrega vários bancos em paralelo, um arquivo por tarefa, e devolve {ano: AgregadoAnual}.
+    # n_processos=None usa um processo por núcleo; n_processos=1 (ou o perfil ligado) roda tudo
+    # no processo atual. consultar(caminho), quando dado, devolve o agregado já pronto (ex.: do
+    # cache) ou None: os prontos são respondidos no processo atual e só os demais vão para os
+    # processos, que nem são criados se sobrar um banco ou nenhum (criar os processos custa
+    # segundos no Windows, muito mais que ler o cache). Arquivos do mesmo ano (ex.: bancos de
+    # municípios diferentes) têm as contagens somadas.
+    prontos = {}
+    if consultar is not None:
+        for caminho in caminhos:
+            agregado = consultar(caminho)
+            if agregado is not None:
+                prontos[caminho] = agregado
+    pendentes = [caminho for caminho in caminhos if caminho not in prontos]
+
+    if n_processos == 1 or len(pendentes) <= 1 or perfil.ativo:
+        prontos.update(zip(pendentes, map(agregar, pendentes)))
+    else:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            prontos.update(zip(pendentes, executor.map(agregar, pendentes)))
+    resultados = [prontos[caminho] for caminho in caminhos]
+
+    agregados = {}
+    with perfil.etapa('redução'):
+        for agregado in resultados:
+            if agregado.ano in agregados:
+                agregado = agregados[agregado.ano] + agregado
+            agregados[agregado.ano] = agregado
+    return agregados
+
+
+class AgregadoAnual:
+    # Contagens de um ano (ou de vários anos somados, com ano None): o cubo (mês, faixa etária,
+    # métrica) e o cubo semanal (período semanal, faixa etária, métrica; ver n_periodos_semanais)
+    # ficam em arrays int64 contíguos e somente leitura, e as somas por mês, os totais e as
+    # proporções acumuladas são calculados uma vez, na criação, para acesso O(1). Bancos do mesmo
+    # ano e o acumulado de vários anos se somam com +. No pickle, as contagens vão comprimidas no
+    # menor tipo inteiro que as comporta (menos de 2 KB por ano), e é assim que os agregados voltam
+    # dos processos de agregar_bancos.
+    __slots__ = ('ano', 'cubo', 'cubo_semanal', 'por_mes', 'totais', 'proporcoes_acumuladas')
+
+    def __init__(self, ano, cubo, cubo_semanal=None):
+        forma_semanal = (n_periodos_semanais, len(fx_et_completa), len(metricas))
+        cubo = np.array(cubo, dtype=np.int64, order='C')
+        if cubo.shape != (12, len(fx_et_completa), len(metricas)):
+            raise ValueError(f'Cubo com forma {cubo.shape}; esperado (12, {len(fx_et_completa)}, {len(metricas)})')
+        # Sem cubo semanal (ex.: agregados montados só com as contagens mensais), as semanas ficam zeradas
+        if cubo_semanal is None:
+            cubo_semanal = np.zeros(forma_semanal, dtype=np.int64)
+        cubo_semanal = np.array(cubo_semanal, dtype=np.int64, order='C')
+        if cubo_semanal.shape != forma_semanal:
+            raise ValueError(f'Cubo semanal com forma {cubo_semanal.shape}; esperado {forma_semanal}')
+        por_mes = cubo.sum(axis=1)
+        totais = por_mes.sum(axis=0)
+        proporcoes = proporcoes_acumuladas_por_periodo(cubo)
+        for array in (cubo, cubo_semanal, por_mes, totais, proporcoes):
+            array.flags.writeable = False
+
+        atribuir = super().__setattr__
+        atribuir('ano', ano)
+        atribuir('cubo', cubo)                     # (mês, faixa etária, métrica)
+        atribuir('cubo_semanal', cubo_semanal)     # (período semanal, faixa etária, métrica)
+        atribuir('por_mes', por_mes)               # (mês, métrica)
+        atribuir('totais', totais)                 # (métrica,)
+        atribuir('proporcoes_acumuladas', proporcoes)  # (mês, métrica), até o fim de cada mês; NaN sem casos
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError('AgregadoAnual é imutável')
+
+    def total(self, metrica):
+        return int(self.totais[metricas.index(metrica)])
+
+    def serie_mensal(self, metrica):
+        # Contagem da métrica em cada mês: array (12,)
+        return self.por_mes[:, metricas.index(metrica)]
+
+    def faixa(self, faixa_etaria):
+        # Contagens de uma faixa etária: array (mês, métrica)
+        return self.cubo[:, fx_et_completa.index(faixa_etaria)]
+
+    def proporcao_ate(self, mes):
+        # Proporção do total anual de cada métrica acumulada até o fim do mês (1 a 12): array (métrica,)
+        return self.proporcoes_acumuladas[mes - 1]
+
+    def proporcoes_horizontes(self):
+        # Proporções m1, m2 e m3 (acumuladas até o fim de março, junho e setembro): array (horizontes, métricas)
+        return self.proporcoes_acumuladas[meses_horizontes]
+
+    def __add__(self, outro):
+        if not isinstance(outro, AgregadoAnual):
+            return NotImplemented
+        return AgregadoAnual(self.ano if self.ano == outro.ano else None, self.cubo + outro.cubo,
+                             self.cubo_semanal + outro.cubo_semanal)
+
+    def __radd__(self, outro):
+        # Permite sum(agregados), que começa somando 0
+        if isinstance(outro, int) and outro == 0:
+            return self
+        return NotImplemented
+
+    def __eq__(self, outro):
+        if not isinstance(outro, AgregadoAnual):
+            return NotImplemented
+        return self.ano == outro.ano and np.array_equal(self.cubo, outro.cubo) and \
+            np.array_equal(self.cubo_semanal, outro.cubo_semanal)
+
+    __hash__ = None
+
+    def __repr__(self):
+        totais = ', '.join(f'{metrica}={total}' for metrica, total in zip(metricas, self.totais.tolist()))
+        return f'AgregadoAnual(ano={self.ano}, {totais})'
+
+    def __reduce__(self):
+        # Os dois cubos vão juntos, um depois do outro, no menor tipo que comporta o maior deles
+        contagens = np.concatenate([self.cubo.ravel(), self.cubo_semanal.ravel()])
+        tipo = np.min_scalar_type(int(contagens.max(initial=0)))
+        return restaurar_agregado_anual, (self.ano, tipo.str, zlib.compress(contagens.astype(tipo).tobytes()))
+
+
+def restaurar_agregado_anual(ano, tipo, dados):
+    # Inverso de AgregadoAnual.__reduce__
+    contagens = np.frombuffer(zlib.decompress(dados), dtype=tipo).reshape(12 + n_periodos_semanais, len(fx_et_completa), len(metricas))
+    return AgregadoAnual(ano, contagens[:12], contagens[12:])
+
+
+# Resultado do processamento de todos os bancos, compartilhado pela visualização e pelas
+# estimativas: anos em ordem, AgregadoAnual de cada ano (com os cubos mensal e semanal),
+# AgregadoAnual do acumulado de todos os anos, anos incompletos (ano_incompleto), anos
+# consolidados (os demais) e o tensor de proporções acumuladas dos anos consolidados,
+# (anos consolidados, mês, métrica), usado pelas estimativas.
+# É imutável (dicionários somente leitura e arrays sem escrita), então o mesmo objeto pode
+# alimentar vários consumidores no mesmo processo.
+DadosAgregados = namedtuple('DadosAgregados', ['anos', 'por_ano', 'acumulado', 'anos_incompletos', 'anos_consolidados',
+                                               'proporcoes'])
+
+
+def carregar_agregados(caminhos, n_processos=None, agregar=None):
+    # Uma única passada de processamento (carregamento, classificação e agregação, com cache
+    # por padrão) sobre todos os bancos, devolvida como DadosAgregados
+    consultar = None
+    if agregar is None:
+        # cache_agregados importa este módulo
+        from cache_agregados import agregar_banco_com_cache as agregar, consultar_cache as consultar
+    agregados = agregar_bancos(caminhos, n_processos, agregar, consultar)
+
+    anos = tuple(sorted(agregados))
+    por_ano = {ano: agregados[ano] for ano in anos}
+    acumulado = sum(por_ano.values(), AgregadoAnual(None, np.zeros((12, len(fx_et_completa), len(metricas)), dtype=np.int64)))
+
+    anos_incompletos = frozenset(ano for ano in anos if ano_incompleto(ano, por_ano[ano].cubo_semanal))
+    anos_consolidados = tuple(ano for ano in anos if ano not in anos_incompletos)
+    proporcoes = np.stack([por_ano[ano].proporcoes_acumuladas for ano in anos_consolidados]) if anos_consolidados \
+        else np.empty((0, 12, len(metricas)))
+    proporcoes.flags.writeable = False
+
+    return DadosAgregados(anos, MappingProxyType(por_ano), acumulado, anos_incompletos, anos_consolidados, proporcoes)
+
+
+def adicionar_opcao_dados(parser):
+    # Opção --dados comum aos scripts (ver encontrar_bancos)
+    parser.add_argument('--dados', default=None, metavar='DIRETORIO',
+                        help=f'diretório com os bancos DENGON*_00<ano>.csv/.dbf/.parquet (padrão: variável de ambiente {variavel_diretorio_dados} ou "{diretorio_dados_padrao}")')
+
+
+def encontrar_bancos_da_linha_de_comando(parser, args):
+    # Bancos do diretório da opção --dados; sem o diretório ou sem nenhum banco, termina com erro de uso
+    if not os.path.isdir(diretorio_de_dados(args.dados)):
+        parser.error(f'diretório de dados não encontrado: {diretorio_de_dados(args.dados)}')
+    caminhos = encontrar_bancos(args.dados)
+    if not caminhos:
+        parser.error('nenhum banco DENGON*_00<ano>.csv/.dbf/.parquet encontrado no diretório de dados')
+    return caminhos
+
+
+def carregar_agregados_da_linha_de_comando(parser, args):
+    # DadosAgregados dos bancos do diretório da opção --dados, com os processos da opção --n-processos
+    return carregar_agregados(encontrar_bancos_da_linha_de_comando(parser, args), args.n_processos)
+
+
+def exibir_ano(agregado, proporcoes=True, incompleto=False):
+    # Totais de um ano (e, nas estimativas, as proporções m1, m2 e m3) no terminal
+    total_notificados, total_confirmados, total_negativos, total_obitos = agregado.totais.tolist()
+
+    print('-'*150)
+    print(f'ANO: {agregado.ano}')
+    print('-'*150)
+    print("Total de Notificados:", total_notificados)
+    print("Total de Confirmados:", total_confirmados)
+    print("Total de Negativos:", total_negativos)
+    print("Total de Óbitos:", total_obitos)
+    print('-'*150)
+    if proporcoes and incompleto:
+        print('Ano incompleto (sem notificações nas últimas semanas do ano): fora das estimativas')
+    elif proporcoes:
+        proporcao_m1, proporcao_m2, proporcao_m3 = agregado.proporcoes_horizontes().tolist()
+        print(f'Proporção m1: {proporcao_m1}')
+        print(f'Proporção m2: {proporcao_m2}')
+        print(f'Proporção m3: {proporcao_m3}')
+    print('-'*150)
+
+
+def exibir_resumo_geral(dados):
+    # Acumulado de todos os anos (por mês e faixa etária e por mês) e totais gerais no terminal
+    total_notificados_geral, total_confirmados_geral, total_negativos_geral, total_obitos_geral = dados.acumulado.totais.tolist()
+
+    print('=' * 150)
+    print("RESUMO GERAL DOS DADOS ACUMULADOS")
+    print('=' * 150)
+    with perfil.etapa('impressão'):
+        print('-'*150)
+        print("Info por mês e faixa etária:", cubo_para_dicts(dados.acumulado.cubo))
+        print('='*150)
+        print("Info por mês:", dados.acumulado.por_mes.tolist())
+    print('=' * 150)
+    print("TOTAIS GERAIS DE TODOS OS ANOS")
+    print('=' * 150)
+    print(f"Total Geral de Notificados: {total_notificados_geral}")
+    print(f"Total Geral de Confirmados: {total_confirmados_geral}")
+    print(f"Total Geral de Negativos: {total_negativos_geral}")
+    print(f"Total Geral de Óbitos: {total_obitos_geral}")